@@ -0,0 +1,99 @@
+"""ConfigManager（除外パターンのコンパイル・判定、再読み込み）のテスト"""
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import web_crawler
+
+
+class ConfigManagerTestCase(unittest.TestCase):
+    """一時ディレクトリの設定ファイルからConfigManagerを生成するテストの基底クラス"""
+
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmpdir.cleanup)
+        self.config_file = os.path.join(self._tmpdir.name, "config.json")
+
+    def make_manager(self, ignore_patterns):
+        """除外パターンだけを持つ設定ファイルを書き出して読み込む（警告表示は捨てる）"""
+        with open(self.config_file, 'w', encoding='utf-8') as f:
+            json.dump({"actions": [], "ignore_patterns": ignore_patterns}, f)
+        with contextlib.redirect_stdout(io.StringIO()):
+            return web_crawler.ConfigManager(self.config_file)
+
+    def matched(self, manager, url):
+        """マッチした除外パターン文字列（マッチしなければNone）"""
+        pattern_config = manager.match_ignore_pattern(url)
+        return pattern_config['pattern'] if pattern_config else None
+
+
+class IgnorePatternTest(ConfigManagerTestCase):
+
+    def test_pattern_types(self):
+        manager = self.make_manager([
+            {"pattern": "logout", "type": "contains"},
+            {"pattern": "https://example.com/exact", "type": "exact"},
+            {"pattern": "https://example.com/admin", "type": "startswith"},
+            {"pattern": ".zip", "type": "endswith"},
+        ])
+        self.assertEqual(self.matched(manager, "https://example.com/LogOut?x=1"), "logout")
+        self.assertEqual(self.matched(manager, "https://example.com/exact"), "https://example.com/exact")
+        self.assertIsNone(self.matched(manager, "https://example.com/exact/more"))
+        self.assertEqual(self.matched(manager, "https://example.com/admin/users"), "https://example.com/admin")
+        self.assertIsNone(self.matched(manager, "https://other.test/?next=https://example.com/admin"))
+        self.assertEqual(self.matched(manager, "https://example.com/file.zip"), ".zip")
+        self.assertIsNone(self.matched(manager, "https://example.com/page"))
+
+    def test_wildcard_is_anchored_to_whole_url(self):
+        manager = self.make_manager([{"pattern": "https://example.com/private/*", "type": "wildcard"}])
+        self.assertIsNotNone(manager.match_ignore_pattern("https://example.com/private/a/b"))
+        self.assertIsNone(manager.match_ignore_pattern("https://other.test/?u=https://example.com/private/a"))
+
+    def test_regex_with_inline_flags_and_backreferences(self):
+        manager = self.make_manager([
+            {"pattern": "(?i)SESSION=", "type": "regex"},
+            {"pattern": r"/(\w+)/\1/", "type": "regex"},
+            {"pattern": "logout", "type": "contains"},
+        ])
+        self.assertEqual(self.matched(manager, "https://example.com/?session=1"), "(?i)SESSION=")
+        self.assertEqual(self.matched(manager, "https://example.com/a/a/"), r"/(\w+)/\1/")
+        self.assertIsNone(self.matched(manager, "https://example.com/a/b/"))
+        self.assertEqual(self.matched(manager, "https://example.com/logout"), "logout")
+
+    def test_duplicate_group_names_do_not_disable_patterns(self):
+        manager = self.make_manager([
+            {"pattern": r"/item/(?P<id>\d+)", "type": "regex"},
+            {"pattern": r"/user/(?P<id>\d+)", "type": "regex"},
+        ])
+        self.assertEqual(self.matched(manager, "https://example.com/item/1"), r"/item/(?P<id>\d+)")
+        self.assertEqual(self.matched(manager, "https://example.com/user/2"), r"/user/(?P<id>\d+)")
+
+    def test_invalid_regex_is_skipped_and_others_still_apply(self):
+        manager = self.make_manager([
+            {"pattern": "(unclosed", "type": "regex"},
+            {"pattern": "logout", "type": "contains"},
+            {"pattern": "disabled", "type": "contains", "enabled": False},
+        ])
+        self.assertEqual([p['pattern'] for p in manager.enabled_ignore_patterns], ["logout"])
+        self.assertEqual(self.matched(manager, "https://example.com/logout"), "logout")
+        self.assertIsNone(self.matched(manager, "https://example.com/disabled"))
+
+    def test_reload_applies_new_patterns_and_bumps_generation(self):
+        manager = self.make_manager([{"pattern": "logout", "type": "contains"}])
+        generation = manager.generation
+        with open(self.config_file, 'w', encoding='utf-8') as f:
+            json.dump({"actions": [], "ignore_patterns": [{"pattern": "admin", "type": "contains"}]}, f)
+        manager.reload()
+        self.assertGreater(manager.generation, generation)
+        self.assertIsNone(self.matched(manager, "https://example.com/logout"))
+        self.assertEqual(self.matched(manager, "https://example.com/admin"), "admin")
+
+
+if __name__ == '__main__':
+    unittest.main()
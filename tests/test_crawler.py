@@ -0,0 +1,231 @@
+"""WebCrawler（ブラウザ・通信を使わない処理）のテスト: リンク抽出・履歴からの再開・再試行待機・対話入力"""
+import contextlib
+import io
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import web_crawler
+from web_crawler import WebCrawler
+
+START_URL = "https://example.com/"
+
+
+class CrawlerTestCase(unittest.TestCase):
+    """一時ディレクトリでSeleniumを使わないWebCrawlerを生成するテストの基底クラス"""
+
+    @classmethod
+    def setUpClass(cls):
+        # crawler.log・サンプル設定などの生成物を一時ディレクトリに閉じ込める
+        cls._tmpdir = tempfile.TemporaryDirectory()
+        cls._cwd = os.getcwd()
+        cls._root_handlers = list(logging.getLogger().handlers)
+        os.chdir(cls._tmpdir.name)
+        with open("config.json", 'w', encoding='utf-8') as f:
+            json.dump({"actions": [], "ignore_patterns": [{"pattern": "logout", "type": "contains"}]}, f)
+
+    @classmethod
+    def tearDownClass(cls):
+        # WebCrawlerが追加したログハンドラを閉じてcrawler.logを解放する
+        root = logging.getLogger()
+        for handler in [h for h in root.handlers if h not in cls._root_handlers]:
+            root.removeHandler(handler)
+            handler.close()
+        os.chdir(cls._cwd)
+        cls._tmpdir.cleanup()
+
+    def make_crawler(self, start_url=START_URL, **kwargs):
+        options = dict(use_selenium=False, config_file="config.json", quiet=True, cookie_log_file=None)
+        options.update(kwargs)
+        with contextlib.redirect_stdout(io.StringIO()):
+            crawler = WebCrawler(start_url, **options)
+        self.addCleanup(crawler.close)
+        return crawler
+
+
+class SampleLinksTest(CrawlerTestCase):
+
+    def test_filters_invalid_visited_duplicate_and_offsite_links(self):
+        crawler = self.make_crawler()
+        crawler._mark_visited("https://example.com/seen")
+        count, links = crawler._sample_links([
+            "https://example.com/a",
+            "https://example.com/a?utm_source=mail",  # 正規化すると/aと同じ
+            "https://example.com/seen",
+            "https://example.com/logout",               # 除外パターン
+            "https://example.com/file.pdf",
+            "mailto:someone@example.com",
+            "https://other.test/b",                     # 別ドメイン
+            "https://example.com/b",
+        ], sample_size=10)
+        self.assertEqual(count, 2)
+        self.assertEqual(sorted(links), ["https://example.com/a", "https://example.com/b"])
+
+    def test_sample_size_and_candidate_cap(self):
+        crawler = self.make_crawler()
+        urls = [f"https://example.com/p{i}" for i in range(100)]
+        random.seed(1)
+        count, links = crawler._sample_links(urls, sample_size=5)
+        self.assertEqual(count, 100)
+        self.assertEqual(len(links), 5)
+        self.assertEqual(len(set(links)), 5)
+        self.assertTrue(set(links) <= set(urls))
+
+        count, links = crawler._sample_links(urls, sample_size=5, max_candidates=20)
+        self.assertEqual(count, 20)
+        self.assertTrue(set(links) <= set(urls[:20]))
+
+    def test_every_candidate_can_be_selected(self):
+        crawler = self.make_crawler()
+        urls = [f"https://example.com/p{i}" for i in range(10)]
+        random.seed(2)
+        selected = set()
+        for _ in range(200):
+            selected.update(crawler._sample_links(urls, sample_size=1)[1])
+        self.assertEqual(selected, set(urls))
+
+    def test_validity_cache_is_reset_after_config_reload(self):
+        crawler = self.make_crawler()
+        url = "https://example.com/admin"
+        self.assertTrue(crawler._is_valid_url(url))
+        config_manager = crawler.config_manager
+        config_manager.config = {"actions": [], "ignore_patterns": [{"pattern": "admin", "type": "contains"}]}
+        with mock.patch.object(config_manager, '_load_config', return_value=config_manager.config):
+            config_manager.reload()
+        self.assertFalse(crawler._is_valid_url(url))
+
+
+class CollectHrefsTest(unittest.TestCase):
+
+    def test_deduplicates_filters_and_stops_at_cap(self):
+        html = "<html><body>" + "".join(
+            f'<a href="/p{i % 5}">x</a><a href="/doc{i}.pdf">d</a><a href="https://other.test/{i}">o</a>'
+            for i in range(20)
+        ) + "</body></html>"
+        invalid_re = WebCrawler._INVALID_RE
+        hrefs = web_crawler._collect_hrefs(html, START_URL, invalid_re, ("https://example.com/",))
+        self.assertEqual(hrefs, [f"https://example.com/p{i}" for i in range(5)])
+
+        capped = web_crawler._collect_hrefs(html, START_URL, invalid_re, None, 3)
+        self.assertEqual(len(capped), 3)
+
+
+class ResumeFromHistoryTest(CrawlerTestCase):
+
+    def write_history(self, records):
+        path = os.path.join(self._tmpdir.name, "history.jsonl")
+        with open(path, 'w', encoding='utf-8') as f:
+            for record in records:
+                # 文字列はそのまま書き込む（書きかけの行の再現用）
+                f.write((record if isinstance(record, str) else json.dumps(record)) + "\n")
+        return path
+
+    @staticmethod
+    def run_header(start_url=START_URL, resumed=False, stay_in_domain=True):
+        return {'kind': 'run', 'timestamp': '', 'resumed': resumed,
+                'start_url': start_url, 'stay_in_domain': stay_in_domain}
+
+    @staticmethod
+    def crawl_record(url, selected_link=None):
+        return {'kind': 'crawl', 'url': url, 'selected_link': selected_link}
+
+    def resume(self, crawler, path):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return crawler._resume_from_history(path)
+
+    def test_resumes_last_run_when_settings_match(self):
+        crawler = self.make_crawler()
+        path = self.write_history([
+            self.run_header(),
+            self.crawl_record("https://example.com/", "https://example.com/a"),
+            self.crawl_record("https://example.com/a", "https://example.com/b"),
+            '{"kind": "crawl", "url": "https://exa',  # 中断時の書きかけの行
+        ])
+        self.assertEqual(self.resume(crawler, path), (True, "https://example.com/b"))
+        self.assertTrue(crawler._is_visited("https://example.com/a"))
+        self.assertEqual(len(crawler.visited_urls), 2)
+
+    def test_only_the_last_run_and_its_resumes_are_replayed(self):
+        crawler = self.make_crawler()
+        path = self.write_history([
+            self.run_header(),
+            self.crawl_record("https://example.com/old", "https://example.com/old2"),
+            self.run_header(),
+            self.crawl_record("https://example.com/", "https://example.com/a"),
+            self.run_header(resumed=True),
+            self.crawl_record("https://example.com/a", "https://example.com/c"),
+        ])
+        self.assertEqual(self.resume(crawler, path), (True, "https://example.com/c"))
+        self.assertFalse(crawler._is_visited("https://example.com/old"))
+        self.assertTrue(crawler._is_visited("https://example.com/"))
+        self.assertTrue(crawler._is_visited("https://example.com/a"))
+
+    def test_restart_clears_visited_urls(self):
+        crawler = self.make_crawler()
+        path = self.write_history([
+            self.run_header(),
+            self.crawl_record("https://example.com/a", "https://example.com/b"),
+            {'kind': 'restart', 'success': True},
+            self.crawl_record("https://example.com/", "https://example.com/c"),
+        ])
+        self.assertEqual(self.resume(crawler, path), (True, "https://example.com/c"))
+        self.assertFalse(crawler._is_visited("https://example.com/a"))
+
+    def test_does_not_resume_when_settings_differ_or_header_is_missing(self):
+        for records in (
+            [self.run_header(start_url="https://other.test/"), self.crawl_record("https://example.com/a", "https://example.com/b")],
+            [self.run_header(stay_in_domain=False), self.crawl_record("https://example.com/a", "https://example.com/b")],
+            [self.crawl_record("https://example.com/a", "https://example.com/b")],
+        ):
+            with self.subTest(records=records[0]):
+                crawler = self.make_crawler()
+                self.assertEqual(self.resume(crawler, self.write_history(records)), (False, None))
+                self.assertEqual(len(crawler.visited_urls), 0)
+
+    def test_missing_file(self):
+        crawler = self.make_crawler()
+        missing = os.path.join(self._tmpdir.name, "missing.jsonl")
+        self.assertEqual(self.resume(crawler, missing), (False, None))
+
+
+class RetryWaitTest(CrawlerTestCase):
+
+    def test_retry_after_seconds_date_and_backoff(self):
+        crawler = self.make_crawler()
+        self.assertEqual(crawler._retry_wait(0, "2"), 2.0)
+        self.assertEqual(crawler._retry_wait(0, "3600"), WebCrawler._MAX_RETRY_WAIT)
+        self.assertEqual(crawler._retry_wait(0, "-5"), 0.0)
+        retry_at = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=5), usegmt=True)
+        self.assertTrue(3.0 <= crawler._retry_wait(0, retry_at) <= 5.0)
+        self.assertEqual(crawler._retry_wait(1, "soon"), WebCrawler._RETRY_BACKOFF * 2)
+        self.assertEqual(crawler._retry_wait(2), WebCrawler._RETRY_BACKOFF * 4)
+
+
+class PromptTest(unittest.TestCase):
+
+    def prompt(self, answers, default=True):
+        with mock.patch('builtins.input', side_effect=answers), contextlib.redirect_stdout(io.StringIO()):
+            return web_crawler.prompt_yes_no("続けますか?", default=default)
+
+    def test_answers_and_default(self):
+        self.assertTrue(self.prompt(["y"], default=False))
+        self.assertFalse(self.prompt(["n"]))
+        self.assertFalse(self.prompt([""], default=False))
+        self.assertTrue(self.prompt(["maybe", "yes"], default=False))
+
+    def test_closed_stdin_uses_default(self):
+        self.assertTrue(self.prompt(EOFError(), default=True))
+        self.assertFalse(self.prompt(EOFError(), default=False))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+"""訪問済みURL集合・履歴の保存（JSON Lines・SQLite）・Cookie列形式のテスト"""
+import json
+import math
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import web_crawler
+from web_crawler import CrawlStateStore, HistoryEntry, JsonLinesWriter, VisitedURLSet, WebCrawler
+
+
+def _strict_json_loads(text):
+    """NaN・Infinity等のJSON外の値を拒否して読み込む"""
+    def reject(constant):
+        raise ValueError(f"JSONの値ではありません: {constant}")
+    return json.loads(text, parse_constant=reject)
+
+
+def _history_entry(cookie_details):
+    return HistoryEntry(
+        step=1, url="https://example.com/", timestamp="2024-01-01 00:00:00", links_found=3,
+        selected_link="https://example.com/a", domain="example.com", action_performed=False,
+        restart_occurred=False, cookie_count=len(cookie_details.get('names', [])), cookie_details=cookie_details
+    )
+
+
+class VisitedURLSetTest(unittest.TestCase):
+
+    def test_add_and_contains(self):
+        visited = VisitedURLSet()
+        visited.add(1, "https://example.com/a")
+        self.assertTrue(visited.contains(1, "https://example.com/a"))
+        self.assertFalse(visited.contains(2, "https://example.com/b"))
+        self.assertEqual(len(visited), 1)
+
+    def test_hash_collision_is_resolved_for_recent_urls(self):
+        visited = VisitedURLSet(recent_size=1)
+        visited.add(1, "https://example.com/a")
+        self.assertFalse(visited.contains(1, "https://example.com/other"))
+        # 文字列を保持していない古いURLはハッシュのみで判定する
+        visited.add(2, "https://example.com/b")
+        self.assertTrue(visited.contains(1, "https://example.com/other"))
+
+    def test_update_and_clear(self):
+        visited = VisitedURLSet()
+        visited.update([10, 20])
+        self.assertTrue(visited.contains(10, "https://example.com/x"))
+        visited.clear()
+        self.assertEqual(len(visited), 0)
+
+
+class CanonicalizeTest(unittest.TestCase):
+
+    def test_tracking_params_fragment_and_default_port_are_ignored(self):
+        canonicalize = WebCrawler._canonicalize
+        self.assertEqual(
+            canonicalize("HTTPS://Example.com:443//a//b/?utm_source=x&b=2&a=1#top"),
+            canonicalize("https://example.com/a/b?a=1&b=2")
+        )
+        self.assertNotEqual(canonicalize("https://example.com/a?id=1"), canonicalize("https://example.com/a?id=2"))
+
+
+class PackCookiesTest(unittest.TestCase):
+
+    def test_columns_round_trip(self):
+        columns = WebCrawler._pack_cookies([
+            {'name': 'sid', 'value': 'abc', 'domain': 'example.com', 'path': '/', 'expiry': 1700000000,
+             'secure': True, 'httpOnly': True},
+            {'name': 'tmp', 'value': 'x', 'domain': 'example.com'},
+        ])
+        self.assertEqual(columns['names'], ['sid', 'tmp'])
+        self.assertEqual(columns['paths'], ['/', 'N/A'])
+        self.assertEqual(columns['expiry'][0], 1700000000.0)
+        self.assertTrue(math.isnan(columns['expiry'][1]))
+        self.assertEqual(list(columns['secure']), [1, 0])
+        self.assertEqual(list(columns['httpOnly']), [1, 0])
+        self.assertEqual(WebCrawler._pack_cookies([]), {})
+
+    def test_missing_expiry_is_serialised_as_null_with_and_without_orjson(self):
+        record = {'expiry': WebCrawler._pack_cookies([{'name': 'tmp'}, {'name': 'sid', 'expiry': 5}])['expiry']}
+        for orjson_available in {False, web_crawler.ORJSON_AVAILABLE}:
+            with self.subTest(orjson=orjson_available), \
+                    mock.patch.object(web_crawler, 'ORJSON_AVAILABLE', orjson_available):
+                line = JsonLinesWriter._dumps(record).decode('utf-8')
+                self.assertEqual(_strict_json_loads(line), {'expiry': [None, 5.0]})
+
+
+class FileStoreTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmpdir.cleanup)
+
+    def path(self, name):
+        return os.path.join(self._tmpdir.name, name)
+
+
+class JsonLinesWriterTest(FileStoreTestCase):
+
+    def read_records(self, path):
+        with open(path, encoding='utf-8') as f:
+            return [_strict_json_loads(line) for line in f]
+
+    def test_appends_after_close_and_truncate_starts_over(self):
+        path = self.path("history.jsonl")
+        writer = JsonLinesWriter(path)
+        writer.write(({'n': 1}, {'n': 2}))
+        writer.close()
+        writer.write(({'n': 3},))
+        writer.close()
+        self.assertEqual(self.read_records(path), [{'n': 1}, {'n': 2}, {'n': 3}])
+
+        writer.truncate()
+        writer.write(({'n': 4},))
+        writer.close()
+        self.assertEqual(self.read_records(path), [{'n': 4}])
+
+    def test_does_not_create_file_until_first_write(self):
+        path = self.path("unused.jsonl")
+        writer = JsonLinesWriter(path)
+        writer.flush()
+        writer.close()
+        self.assertFalse(os.path.exists(path))
+
+
+class CrawlStateStoreTest(FileStoreTestCase):
+
+    def test_visited_hashes_round_trip_including_high_bit(self):
+        path = self.path("state.db")
+        store = CrawlStateStore(path)
+        hashes = {1, (1 << 63) + 5, (1 << 64) - 1}
+        for url_hash in hashes:
+            store.add_visited(url_hash)
+        store.close()
+
+        store = CrawlStateStore(path)
+        self.addCleanup(store.close)
+        self.assertEqual(store.load_visited(), hashes)
+        store.clear_visited()
+        self.assertEqual(store.load_visited(), set())
+
+    def test_history_is_stored_as_valid_json(self):
+        store = CrawlStateStore(self.path("state.db"))
+        self.addCleanup(store.close)
+        cookies = WebCrawler._pack_cookies([{'name': 'tmp', 'value': 'x'}])
+        store.add_history('crawl', _history_entry(cookies))
+        store.add_history('action', {'step': None, 'url': 'https://example.com/', 'success': True})
+        store.flush()
+
+        rows = store._db.execute("SELECT kind, step, url, data FROM history ORDER BY rowid").fetchall()
+        self.assertEqual([(kind, step) for kind, step, _, _ in rows], [('crawl', 1), ('action', None)])
+        data = _strict_json_loads(rows[0][3])
+        self.assertEqual(data['cookie_details']['expiry'], [None])
+        self.assertEqual(data['cookie_details']['secure'], [0])
+
+
+if __name__ == '__main__':
+    unittest.main()
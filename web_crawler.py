@@ -7,37 +7,116 @@
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+from urllib3.util.retry import Retry
 import time
 import random
 import re
 import json
 import os
-from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
-from datetime import datetime
+import sys
+import argparse
+import importlib.util
+import shutil
+import fnmatch
+import hashlib
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, asdict, is_dataclass
+from functools import lru_cache
+import math
+from array import array
+import sqlite3
+from urllib.parse import urljoin, urlparse, urlunparse, parse_qsl, urlencode
+from lxml import etree
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 import logging
-from typing import List, Set, Optional, Dict, Any
+from io import BytesIO
+import asyncio
+import threading
+import concurrent.futures
+import multiprocessing
+from typing import List, Set, Optional, Dict, Any, Tuple, Iterable, Iterator
 
-# Selenium関連のインポート
+# Selenium関連のインポート（起動を速くするため初回使用時に読み込む）
+SELENIUM_AVAILABLE: Optional[bool] = None
+
+def _ensure_selenium() -> bool:
+    """Seleniumを読み込み、利用可能か返す（読み込みは初回のみ）"""
+    global SELENIUM_AVAILABLE, webdriver, By, WebDriverWait, EC, Options, TimeoutException, NoSuchElementException
+    if SELENIUM_AVAILABLE is None:
+        try:
+            from selenium import webdriver
+            from selenium.webdriver.common.by import By
+            from selenium.webdriver.support.ui import WebDriverWait
+            from selenium.webdriver.support import expected_conditions as EC
+            from selenium.webdriver.chrome.options import Options
+            from selenium.common.exceptions import TimeoutException, NoSuchElementException
+            SELENIUM_AVAILABLE = True
+        except ImportError:
+            SELENIUM_AVAILABLE = False
+            print("⚠️ Warning: selenium がインストールされていません。ページ操作機能は無効になります。")
+            print("インストール: pip install selenium")
+    return SELENIUM_AVAILABLE
+
+# aiohttp関連のインポート（フォールバック経路の並列取得用）
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+# httpx関連のインポート（http2=True指定時のフォールバック取得をHTTP/2で行う）
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+# xxhash関連のインポート（訪問済みURLのハッシュ化用、無い場合はhashlibを使用）
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+# pyahocorasick関連のインポート（アクションのURL条件検索用、無い場合は順次検索）
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# orjson関連のインポート（Cookie詳細ログのJSON化用、無い場合は標準のjsonを使用）
 try:
-    from selenium import webdriver
-    from selenium.webdriver.common.by import By
-    from selenium.webdriver.support.ui import WebDriverWait
-    from selenium.webdriver.support import expected_conditions as EC
-    from selenium.webdriver.chrome.options import Options
-    from selenium.common.exceptions import TimeoutException, NoSuchElementException
-    SELENIUM_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    SELENIUM_AVAILABLE = False
-    print("⚠️ Warning: selenium がインストールされていません。ページ操作機能は無効になります。")
-    print("インストール: pip install selenium")
+    ORJSON_AVAILABLE = False
+
+# 設定ファイルが無い場合にコピーするサンプル設定
+SAMPLE_CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "crawler_config.sample.json")
 
 class ConfigManager:
     """設定ファイル管理クラス"""
     
     def __init__(self, config_file: str = "crawler_config.json"):
         self.config_file = config_file
+        # 再読み込みのたびに増える世代番号（設定に依存するキャッシュの無効化用）
+        self.generation = 0
+        self.config = self._load_config()
+        self._compile_ignore_patterns()
+        self._build_action_index()
+        self._prepare_action_locators()
+    
+    def reload(self):
+        """設定ファイルを再読み込み（除外パターン・アクション索引も再作成）"""
         self.config = self._load_config()
+        self._compile_ignore_patterns()
+        self._build_action_index()
+        self._prepare_action_locators()
+        self.generation += 1
     
     def _load_config(self) -> Dict[str, Any]:
         """設定ファイルを読み込み"""
@@ -53,213 +132,678 @@ class ConfigManager:
             return {"actions": []}
     
     def _create_sample_config(self):
-        """サンプル設定ファイルを作成"""
-        sample_config = {
-            "word_lists": {
-                "names": [
-                    "山田太郎", "佐藤花子", "田中一郎", "鈴木次郎", "高橋美咲",
-                    "渡辺健太", "伊藤愛子", "中村隆", "小林麻衣", "加藤大輔"
-                ],
-                "cities": [
-                    "東京", "大阪", "名古屋", "福岡", "札幌", 
-                    "横浜", "神戸", "京都", "広島", "仙台"
-                ],
-                "companies": [
-                    "株式会社サンプル", "有限会社テスト", "合同会社デモ",
-                    "株式会社例示", "企業株式会社", "サンプル商事"
-                ],
-                "search_keywords": [
-                    "Python プログラミング", "機械学習 入門", "ウェブ開発",
-                    "データサイエンス", "人工知能", "JavaScript 学習"
-                ],
-                "emails": [
-                    "test@example.com", "sample@test.co.jp", "demo@sample.org",
-                    "user@demo.net", "info@example.jp"
-                ],
-                "phone_numbers": [
-                    "03-1234-5678", "06-9876-5432", "052-1111-2222",
-                    "092-3333-4444", "011-5555-6666"
-                ],
-                "keywords": [
-                    "apple", "banana", "computer", "development", "education",
-                    "football", "garden", "happiness", "internet", "journey",
-                    "keyboard", "language", "mountain", "network", "ocean",
-                    "picture", "quality", "research", "science", "technology",
-                    "umbrella", "vacation", "website", "exercise", "yellow",
-                    "zebra", "adventure", "birthday", "creativity", "design",
-                    "environment", "friendship", "guitar", "healthy", "innovation",
-                    "justice", "knowledge", "learning", "music", "nature",
-                    "opportunity", "programming", "question", "rainbow", "solution",
-                    "travel", "universe", "victory", "wisdom", "exchange"
-                ]
-            },
-            "ignore_patterns": [
-                {
-                    "pattern": "logout",
-                    "type": "contains",
-                    "description": "ログアウトページを除外（部分一致）",
-                    "enabled": true
-                },
-                {
-                    "pattern": "admin",
-                    "type": "contains", 
-                    "description": "管理画面を除外（部分一致）",
-                    "enabled": true
-                },
-                {
-                    "pattern": "privacy",
-                    "type": "contains",
-                    "description": "プライバシーポリシーページを除外（部分一致）",
-                    "enabled": true
-                },
-                {
-                    "pattern": "terms",
-                    "type": "contains",
-                    "description": "利用規約ページを除外（部分一致）",
-                    "enabled": true
-                },
-                {
-                    "pattern": "contact",
-                    "type": "contains",
-                    "description": "お問い合わせページを除外（部分一致）",
-                    "enabled": false
-                },
-                {
-                    "pattern": "https://example.com/exact/path",
-                    "type": "exact",
-                    "description": "特定のURLを完全一致で除外",
-                    "enabled": false
-                },
-                {
-                    "pattern": "https://example.com/admin",
-                    "type": "startswith",
-                    "description": "adminで始まるURLを除外",
-                    "enabled": false
-                },
-                {
-                    "pattern": ".pdf",
-                    "type": "endswith",
-                    "description": "PDFファイルを除外",
-                    "enabled": false
-                },
-                {
-                    "pattern": "^https://example\\.com/admin/.*",
-                    "type": "regex",
-                    "description": "正規表現でadmin配下を除外",
-                    "enabled": false
-                },
-                {
-                    "pattern": "https://example.com/*.pdf",
-                    "type": "wildcard",
-                    "description": "ワイルドカードでPDFファイルを除外",
-                    "enabled": false
-                }
-            ],
-            "actions": [
-                {
-                    "name": "ログインフォーム例",
-                    "url_pattern": "example.com/login",
-                    "description": "ログインページでの自動入力例",
-                    "inputs": [
-                        {
-                            "xpath": "//input[@name='username']",
-                            "random_values": ["user1", "testuser", "sample_user", "demo_user"],
-                            "description": "ユーザー名（ランダム選択）"
-                        },
-                        {
-                            "xpath": "//input[@name='password']",
-                            "value": "testpass",
-                            "description": "パスワード（固定値）"
-                        }
-                    ],
-                    "click_element": "//button[@type='submit']",
-                    "wait_after_click": 3,
-                    "enabled": False
-                },
-                {
-                    "name": "検索フォーム例",
-                    "url_pattern": "google.com",
-                    "description": "Google検索の例（ランダムキーワード）",
-                    "inputs": [
-                        {
-                            "xpath": "//input[@name='q']",
-                            "value_list": "search_keywords",
-                            "description": "検索キーワード（リスト参照）"
-                        }
-                    ],
-                    "click_element": "//input[@value='Google 検索']",
-                    "wait_after_click": 2,
-                    "enabled": False
-                },
-                {
-                    "name": "お問い合わせフォーム例",
-                    "url_pattern": "contact",
-                    "description": "お問い合わせフォームでのランダム入力例",
-                    "inputs": [
-                        {
-                            "xpath": "//input[@name='name']",
-                            "value_list": "names",
-                            "description": "名前（names リストから選択）"
-                        },
-                        {
-                            "xpath": "//input[@name='email']",
-                            "value_list": "emails",
-                            "description": "メールアドレス（emails リストから選択）"
-                        },
-                        {
-                            "xpath": "//input[@name='company']",
-                            "value_list": "companies",
-                            "description": "会社名（companies リストから選択）"
-                        },
-                        {
-                            "xpath": "//input[@name='city']",
-                            "random_values": ["新宿区", "渋谷区", "中央区", "港区"],
-                            "description": "都市（直接ランダム値指定）"
-                        },
-                        {
-                            "xpath": "//textarea[@name='message']",
-                            "random_values": [
-                                "お世話になっております。サービスについてお問い合わせです。",
-                                "貴社のサービスに興味があります。詳細を教えてください。",
-                                "料金プランについて教えてください。",
-                                "無料トライアルは可能でしょうか？"
-                            ],
-                            "description": "お問い合わせ内容（ランダム選択）"
-                        }
-                    ],
-                    "click_element": "//button[contains(text(), '送信')]",
-                    "wait_after_click": 5,
-                    "enabled": False
-                }
-            ]
-        }
-        
+        """サンプル設定ファイルを作成（同梱のテンプレートをコピー）"""
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(sample_config, f, ensure_ascii=False, indent=2)
+            shutil.copyfile(SAMPLE_CONFIG_FILE, self.config_file)
             print(f"📁 サンプル設定ファイル '{self.config_file}' を作成しました")
         except Exception as e:
             print(f"❌ 設定ファイル作成エラー: {e}")
     
-    def get_actions_for_url(self, url: str) -> List[Dict[str, Any]]:
-        """指定URLに対応するアクションを取得"""
-        matching_actions = []
-        for action in self.config.get("actions", []):
-            if not action.get("enabled", True):
+    def _compile_ignore_patterns(self):
+        """有効な除外パターンをパターンごとに検証し、連結できるものは1つの正規表現（選択肢の連結）にまとめる"""
+        self._ignore_pattern_configs: List[Dict[str, Any]] = []
+        # 連結した正規表現で判定するパターンと、個別の正規表現で判定するパターン
+        combinable: List[Tuple[str, Dict[str, Any]]] = []
+        self._ignore_individual: List[Tuple[re.Pattern, Dict[str, Any]]] = []
+        
+        for pattern_config in self.config.get('ignore_patterns', []):
+            # enabledがFalseの場合はスキップ
+            if not pattern_config.get('enabled', True):
+                continue
+            
+            pattern = pattern_config.get('pattern', '')
+            pattern_type = pattern_config.get('type', 'contains')  # デフォルトは部分一致
+            
+            if not pattern:
                 continue
             
-            url_pattern = action.get("url_pattern", "")
-            if url_pattern and url_pattern in url:
-                matching_actions.append(action)
+            # パターンタイプに応じて正規表現に変換
+            if pattern_type == 'contains':
+                expression = re.escape(pattern)
+            elif pattern_type == 'exact':
+                expression = r'\A' + re.escape(pattern) + r'\Z'
+            elif pattern_type == 'startswith':
+                expression = r'\A' + re.escape(pattern)
+            elif pattern_type == 'endswith':
+                expression = re.escape(pattern) + r'\Z'
+            elif pattern_type == 'regex':
+                expression = pattern
+            elif pattern_type == 'wildcard':
+                # ワイルドカード（*と?をサポート、URL全体に対して一致）
+                expression = r'\A' + fnmatch.translate(pattern)
+            else:
+                continue
+            
+            # パターン単体で検証（構文エラーのパターンのみ無視する）
+            try:
+                compiled = re.compile(expression, re.IGNORECASE)
+            except re.error as e:
+                print(f"⚠️ 除外パターンエラー [{pattern_type}]: {pattern} - {e}")
+                continue
+            self._ignore_pattern_configs.append(pattern_config)
+            
+            # グループ（後方参照・名前付きグループ）やインラインフラグを含む正規表現は連結すると意味が変わるため個別に判定
+            if pattern_type == 'regex' and (compiled.groups or not self._is_combinable(expression)):
+                self._ignore_individual.append((compiled, pattern_config))
+            else:
+                combinable.append((expression, pattern_config))
         
-        return matching_actions
+        # マッチしたパターンを特定できるよう名前付きグループで囲んで連結
+        self._ignore_regex = None
+        self._ignore_regex_configs = [pattern_config for _, pattern_config in combinable]
+        if combinable:
+            try:
+                self._ignore_regex = re.compile(
+                    '|'.join(f"(?P<p{index}>{expression})" for index, (expression, _) in enumerate(combinable)),
+                    re.IGNORECASE
+                )
+            except re.error as e:
+                # 連結できない場合もパターンは無効にせず、個別に判定する
+                print(f"⚠️ 除外パターンを連結できないため個別に判定します: {e}")
+                self._ignore_individual[:0] = [
+                    (re.compile(expression, re.IGNORECASE), pattern_config)
+                    for expression, pattern_config in combinable
+                ]
+                self._ignore_regex_configs = []
+    
+    @staticmethod
+    def _is_combinable(expression: str) -> bool:
+        """グループで囲んでも単体と同じ意味でコンパイルできるか（先頭のインラインフラグ等を検出）"""
+        try:
+            re.compile(f"(?:{expression})")
+            return True
+        except re.error:
+            return False
+    
+    @property
+    def enabled_ignore_patterns(self) -> List[Dict[str, Any]]:
+        """コンパイル済みの（有効かつ正しい）除外パターン設定の一覧"""
+        return self._ignore_pattern_configs
+    
+    def match_ignore_pattern(self, url: str) -> Optional[Dict[str, Any]]:
+        """URLにマッチした除外パターン設定を取得（マッチしない場合はNone）"""
+        if self._ignore_regex is not None:
+            match = self._ignore_regex.search(url)
+            if match is not None:
+                return self._ignore_regex_configs[int(match.lastgroup[1:])]
+        
+        for compiled, pattern_config in self._ignore_individual:
+            if compiled.search(url):
+                return pattern_config
+        return None
+    
+    def _build_action_index(self):
+        """有効なアクションのurl_patternから検索用の索引（Aho-Corasickオートマトン）を作成"""
+        self._enabled_actions = [
+            action for action in self.config.get("actions", [])
+            if action.get("enabled", True) and action.get("url_pattern")
+        ]
+        self._action_automaton = None
+        if not AHOCORASICK_AVAILABLE or not self._enabled_actions:
+            return
+        
+        automaton = ahocorasick.Automaton()
+        for index, action in enumerate(self._enabled_actions):
+            url_pattern = action["url_pattern"]
+            if url_pattern in automaton:
+                automaton.get(url_pattern).append(index)
+            else:
+                automaton.add_word(url_pattern, [index])
+        automaton.make_automaton()
+        self._action_automaton = automaton
+    
+    def _prepare_action_locators(self):
+        """アクションのXPATHを検証し、ロケーター（By.XPATH, xpath）と待機条件を作成して保持"""
+        if not SELENIUM_AVAILABLE:
+            return
+        
+        for action in self.config.get("actions", []):
+            first_input_locator = None
+            for input_config in action.get("inputs", []):
+                input_config["_locator"] = self._xpath_locator(input_config.get("xpath"))
+                input_config["_present"] = self._presence_condition(input_config["_locator"])
+                if first_input_locator is None:
+                    first_input_locator = input_config["_locator"]
+            
+            action["_click_locator"] = self._xpath_locator(action.get("click_element"))
+            action["_clickable"] = (EC.element_to_be_clickable(action["_click_locator"])
+                                    if action["_click_locator"] else None)
+            action["_wait_locator"] = self._xpath_locator(action.get("wait_for_xpath"))
+            action["_wait_present"] = self._presence_condition(action["_wait_locator"])
+            # ページ読み込み完了の目安として最初に待機する要素
+            action["_first_input_locator"] = first_input_locator or action["_click_locator"]
+            action["_first_input_present"] = self._presence_condition(action["_first_input_locator"])
+    
+    def _xpath_locator(self, xpath: Optional[str]) -> Optional[Tuple[str, str]]:
+        """XPATHの構文を検証してロケーターに変換（未指定・構文エラーはNone）"""
+        if not xpath:
+            return None
+        try:
+            etree.XPath(xpath)
+        except etree.XPathSyntaxError as e:
+            print(f"⚠️ XPATHの構文エラーのため無視します: {xpath} ({e})")
+            return None
+        return (By.XPATH, xpath)
+    
+    @staticmethod
+    def _presence_condition(locator: Optional[Tuple[str, str]]):
+        """要素の出現を待つ条件（ロケーターがなければNone）"""
+        return EC.presence_of_element_located(locator) if locator else None
+    
+    def get_actions_for_url(self, url: str) -> List[Dict[str, Any]]:
+        """指定URLに対応するアクションを取得（設定ファイルの記述順）"""
+        if self._action_automaton is None:
+            return [action for action in self._enabled_actions if action["url_pattern"] in url]
+        
+        # URLを1回走査するだけで、含まれる全パターンを検出
+        matched_indexes = set()
+        for _, indexes in self._action_automaton.iter(url):
+            matched_indexes.update(indexes)
+        return [self._enabled_actions[index] for index in sorted(matched_indexes)]
+
+class ContentFingerprintIndex:
+    """ページ内容のSimHash指紋による近似重複判定クラス"""
+    
+    # 64bitの指紋を16bit×4ブロックに分割して索引化する
+    # （ハミング距離3以内の指紋同士は、鳩の巣原理により必ずどれか1ブロックが一致する）
+    _BLOCK_COUNT = 4
+    _BLOCK_BITS = 16
+    _BLOCK_MASK = (1 << 16) - 1
+    
+    # 比較対象から除外する部分（スクリプト・スタイル・タグ・数字）
+    _SCRIPT_STYLE_RE = re.compile(r'<(script|style)\b.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+    _NOISE_RE = re.compile(r'<[^>]+>|\d+')
+    _TOKEN_RE = re.compile(r'\w+')
+    
+    def __init__(self, max_distance: int = 3):
+        self.max_distance = min(max_distance, self._BLOCK_COUNT - 1)
+        self._buckets: Dict[Tuple[int, int], List[int]] = {}
+        self._count = 0
+    
+    @classmethod
+    def simhash(cls, html: str) -> int:
+        """HTMLの本文テキストから64bitのSimHashを計算"""
+        text = cls._NOISE_RE.sub(' ', cls._SCRIPT_STYLE_RE.sub(' ', html))
+        tokens = set(cls._TOKEN_RE.findall(text.lower()))
+        
+        weights = [0] * 64
+        for token in tokens:
+            token_hash = int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest(), 'big')
+            for bit in range(64):
+                if token_hash >> bit & 1:
+                    weights[bit] += 1
+                else:
+                    weights[bit] -= 1
+        
+        fingerprint = 0
+        for bit, weight in enumerate(weights):
+            if weight > 0:
+                fingerprint |= 1 << bit
+        return fingerprint
+    
+    def check_and_add(self, fingerprint: int) -> bool:
+        """近似重複の指紋が登録済みならTrue、未登録なら登録してFalse"""
+        keys = [
+            (i, (fingerprint >> (i * self._BLOCK_BITS)) & self._BLOCK_MASK)
+            for i in range(self._BLOCK_COUNT)
+        ]
+        for key in keys:
+            for other in self._buckets.get(key, ()):
+                if bin(fingerprint ^ other).count('1') <= self.max_distance:
+                    return True
+        
+        for key in keys:
+            self._buckets.setdefault(key, []).append(fingerprint)
+        self._count += 1
+        return False
+    
+    def clear(self):
+        """登録済みの指紋をすべて削除"""
+        self._buckets.clear()
+        self._count = 0
+    
+    def __len__(self) -> int:
+        return self._count
+
+class BrowserPool:
+    """WebDriverプール管理クラス（予備ドライバーを起動済みの状態で保持）"""
+    
+    def __init__(self, driver_factory, size: int = 1):
+        """
+        Args:
+            driver_factory: ドライバー番号を受け取りWebDriverを生成する関数
+            size: 使用中のドライバーを含むプール全体の台数
+        """
+        self.driver_factory = driver_factory
+        self.size = max(1, size)
+        self._spares: List[Any] = []
+        self._created_count = 0
+    
+    def acquire(self):
+        """起動済みのドライバーを取得（予備がなければ新規起動）"""
+        if self._spares:
+            return self._spares.pop()
+        return self._create()
+    
+    def replenish(self):
+        """予備ドライバーをプールサイズまで補充"""
+        while len(self._spares) < self.size - 1:
+            self._spares.append(self._create())
+    
+    def quit_all(self):
+        """予備ドライバーをすべて終了"""
+        while self._spares:
+            try:
+                self._spares.pop().quit()
+            except:
+                pass
+    
+    def _create(self):
+        driver = self.driver_factory(self._created_count)
+        self._created_count += 1
+        return driver
+
+class VisitedURLSet:
+    """訪問済みURLの集合（64bitハッシュで保持し、直近のURLは文字列も保持してハッシュ衝突を判別）"""
+    
+    def __init__(self, recent_size: int = 1024):
+        """
+        Args:
+            recent_size: 衝突判別用に正規化後URLの文字列を保持する件数
+        """
+        self.recent_size = recent_size
+        self._keys: Set[int] = set()
+        self._recent: "OrderedDict[int, str]" = OrderedDict()
+    
+    def add(self, url_key: int, canonical_url: str):
+        """訪問済みURLを追加"""
+        self._keys.add(url_key)
+        self._recent[url_key] = canonical_url
+        self._recent.move_to_end(url_key)
+        if len(self._recent) > self.recent_size:
+            self._recent.popitem(last=False)
+    
+    def contains(self, url_key: int, canonical_url: str) -> bool:
+        """訪問済みか判定（直近のURLと衝突した場合は文字列で判別）"""
+        if url_key not in self._keys:
+            return False
+        recent_url = self._recent.get(url_key)
+        return recent_url is None or recent_url == canonical_url
+    
+    def update(self, url_keys: Iterable[int]):
+        """ハッシュのみを一括追加（保存済みの状態からの再開用）"""
+        self._keys.update(url_keys)
+    
+    def keys(self) -> Set[int]:
+        """保持しているハッシュの集合"""
+        return self._keys
+    
+    def clear(self):
+        self._keys.clear()
+        self._recent.clear()
+    
+    def __len__(self) -> int:
+        return len(self._keys)
+
+@dataclass
+class HistoryEntry:
+    """巡回履歴の1ステップ分（Python 3.9でも使えるよう__slots__は明示的に定義）"""
+    __slots__ = ('step', 'url', 'timestamp', 'links_found', 'selected_link', 'domain',
+                 'action_performed', 'restart_occurred', 'cookie_count', 'cookie_details')
+    step: int
+    url: str
+    timestamp: str
+    links_found: int
+    selected_link: Optional[str]
+    domain: str
+    action_performed: bool
+    restart_occurred: bool
+    cookie_count: int
+    cookie_details: Dict[str, Any]
+
+class CrawlStateStore:
+    """訪問済みURLと各種履歴をSQLite（WALモード）に保存するクラス（中断後の再開用）"""
+    
+    # 書き込みはまとめて行い、1件ごとのコミットを避ける
+    _FLUSH_SIZE = 100
+    
+    def __init__(self, db_path: str = "crawler_state.db"):
+        self.db_path = db_path
+        self._db = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS visited (url_hash INTEGER PRIMARY KEY)")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS history ("
+            "kind TEXT NOT NULL, step INTEGER, url TEXT, ts TEXT, data TEXT NOT NULL)"
+        )
+        self._pending_visited: List[Tuple[int]] = []
+        self._pending_history: List[Tuple[str, Optional[int], Optional[str], Optional[str], str]] = []
+    
+    @staticmethod
+    def _to_signed(url_hash: int) -> int:
+        """64bit符号なし整数をSQLiteのINTEGER（符号付き64bit）に収まる値に変換"""
+        return url_hash - (1 << 64) if url_hash >= (1 << 63) else url_hash
+    
+    @staticmethod
+    def _json_default(value: Any) -> Any:
+        """JSONに変換できない値の変換（Cookie列のarray・bytearrayはリストに）"""
+        if isinstance(value, array) and value.typecode in 'fd':
+            # 有効期限なしを表すNaNはJSONの値ではないためnullにする（orjsonの有無で出力を変えない）
+            return [None if math.isnan(item) else item for item in value]
+        if isinstance(value, (array, bytearray)):
+            return list(value)
+        return str(value)
+    
+    def load_visited(self) -> Set[int]:
+        """保存済みの訪問済みURLハッシュを読み込み"""
+        self.flush()
+        return {url_hash & 0xFFFFFFFFFFFFFFFF for (url_hash,) in self._db.execute("SELECT url_hash FROM visited")}
+    
+    def add_visited(self, url_hash: int):
+        """訪問済みURLハッシュを追加"""
+        self._pending_visited.append((self._to_signed(url_hash),))
+        if len(self._pending_visited) >= self._FLUSH_SIZE:
+            self.flush()
+    
+    def clear_visited(self):
+        """訪問済みURLハッシュを全削除（ブラウザリスタート時）"""
+        self._pending_visited.clear()
+        self._db.execute("DELETE FROM visited")
+    
+    def add_history(self, kind: str, entry: Any):
+        """履歴（crawl / action / restart）を1件追加"""
+        if is_dataclass(entry):
+            entry = asdict(entry)
+        self._pending_history.append((
+            kind, entry.get('step'), entry.get('url'), entry.get('timestamp'),
+            json.dumps(entry, ensure_ascii=False, default=self._json_default)
+        ))
+        if len(self._pending_history) >= self._FLUSH_SIZE:
+            self.flush()
+    
+    def flush(self):
+        """未書き込みの訪問済みURL・履歴を1トランザクションで書き込み"""
+        if not self._pending_visited and not self._pending_history:
+            return
+        with self._db:
+            self._db.execute("BEGIN")
+            self._db.executemany("INSERT OR IGNORE INTO visited VALUES (?)", self._pending_visited)
+            self._db.executemany("INSERT INTO history VALUES (?, ?, ?, ?, ?)", self._pending_history)
+        self._pending_visited.clear()
+        self._pending_history.clear()
+    
+    def close(self):
+        """書き込みを完了して接続を閉じる"""
+        try:
+            self.flush()
+        finally:
+            self._db.close()
+
+class JsonLinesWriter:
+    """記録をJSON Lines形式（1行1件）でファイルに追記（Cookie詳細・巡回履歴の逐次保存用）"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+        # 並列ワーカーで共有するため書き込みは排他する
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _dumps(record: Dict[str, Any]) -> bytes:
+        """1件分のJSON行を生成"""
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(record, default=CrawlStateStore._json_default) + b'\n'
+        return json.dumps(record, ensure_ascii=False, default=CrawlStateStore._json_default).encode('utf-8') + b'\n'
+    
+    def write(self, records: Iterable[Dict[str, Any]]):
+        """記録をまとめて書き込み（ファイルは初回書き込み時に開く）"""
+        lines = [self._dumps(record) for record in records]
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, 'ab', buffering=1 << 16)
+            self._file.writelines(lines)
+    
+    def truncate(self):
+        """ファイルを空にする（以降の書き込みは先頭から）"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+            self._file = open(self.path, 'wb', buffering=1 << 16)
+    
+    def flush(self):
+        """バッファの内容をファイルに書き出す"""
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+    
+    def close(self):
+        """ディスクへの書き込みを完了してファイルを閉じる（以降に書き込みがあれば追記で開き直す）"""
+        with self._lock:
+            if self._file is not None:
+                try:
+                    self._file.flush()
+                    os.fsync(self._file.fileno())
+                finally:
+                    self._file.close()
+                    self._file = None
+
+@lru_cache(maxsize=4096)
+def _netloc(url: str) -> str:
+    """URLのホスト部（同じURLは再パースしない）"""
+    return urlparse(url).netloc
+
+def _parse_hrefs(html: str, current_url: str) -> Iterator[str]:
+    """aタグのhref属性を絶対URLで順次取得（lxmlでストリーム解析、失敗時はBeautifulSoup）"""
+    logger = logging.getLogger(__name__)
+    base_url = current_url
+    yielded = False
+    try:
+        source = BytesIO(html.encode('utf-8'))
+        for _, element in etree.iterparse(source, events=('end',), tag=('a', 'base'),
+                                          html=True, encoding='utf-8'):
+            href = element.get('href')
+            if href is not None:
+                if element.tag == 'base':
+                    # <base href>があれば相対URLの基準にする
+                    base_url = urljoin(current_url, href.strip())
+                else:
+                    # 相対URLを絶対URLに変換
+                    yielded = True
+                    yield urljoin(base_url, href.strip())
+            
+            # 処理済みの要素を解放し、ページサイズに比例したメモリ消費を避ける
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+        return
+    
+    except Exception as e:
+        if yielded:
+            logger.warning("lxml解析エラー（途中までのリンクを使用）: %s", e)
+            return
+        logger.warning("lxml解析エラー（BeautifulSoupで再解析）: %s", e)
+    
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, 'html.parser')
+    for a_tag in soup.find_all('a', href=True):
+        yield urljoin(current_url, a_tag['href'].strip())
+
+def _collect_hrefs(html: str, current_url: str, invalid_re: re.Pattern,
+                   allowed_prefixes: Optional[Tuple[str, ...]], max_hrefs: Optional[int] = None) -> List[str]:
+    """ワーカープロセス用: 文字列比較だけで除外できるURLを除いたhrefを重複なく最大max_hrefs件返す"""
+    hrefs: List[str] = []
+    seen = set()
+    for url in _parse_hrefs(html, current_url):
+        if url in seen or invalid_re.search(url):
+            continue
+        if allowed_prefixes is not None and not url.startswith(allowed_prefixes):
+            continue
+        seen.add(url)
+        hrefs.append(url)
+        # 候補数の上限に達したら残りのHTMLは解析しない
+        if max_hrefs is not None and len(hrefs) >= max_hrefs:
+            break
+    return hrefs
 
 class WebCrawler:
+    # インスタンス属性（属性辞書を持たせず、属性アクセスを軽くする）
+    __slots__ = (
+        # 巡回設定
+        'start_url', 'max_steps', 'delay', 'stay_in_domain', 'max_links_per_page', 'use_selenium',
+        'restart_enabled', 'restart_range', 'restart_min', 'restart_max', 'next_restart_step', 'restart_count',
+        'fast_mode', 'headless', 'log_cookies', 'prefetch_count', 'fetch_concurrency', 'http2', 'browser_pool_size',
+        'browser_cache_dir', 'browser_profile_dir', 'config_file', 'content_dedup', 'parallel_workers',
+        'parser_workers', 'quiet',
+        # ログ・設定
+        'logger', 'console', 'config_manager', '_valid_url_cache', '_valid_url_generation', 'base_domain', '_allowed_prefixes',
+        # 訪問済みURL・履歴
+        'visited_urls', 'crawl_history', 'action_history', 'restart_history', 'state_store', 'cookie_log', 'history_log',
+        '_timestamp_second', '_timestamp_text', 'content_index', '_stop_event',
+        # HTTP通信・解析
+        'session', '_http2_client', '_loop', '_loop_thread', '_aio_session', '_fetch_semaphore',
+        '_host_locks', '_host_next_request', '_prefetch_futures', '_parser_pool',
+        # Selenium
+        'driver', 'browser_pool', '_last_loaded_url',
+    )
+    
+    # マーケティングタグの有無を1回のWebDriver呼び出しでまとめて判定するスクリプト
+    _MARKETING_TAG_SCRIPT = """
+        return {
+            gtm: typeof gtag !== 'undefined' || typeof dataLayer !== 'undefined',
+            ga: typeof ga !== 'undefined' || typeof gtag !== 'undefined',
+            fb: typeof fbq !== 'undefined',
+            adobe: typeof s !== 'undefined' || typeof adobe !== 'undefined'
+        };
+    """
+    
+    # いずれかのマーケティングタグが現れるまでブラウザ内で待機し、判定結果を1回で返す非同期スクリプト
+    # （arguments[0]: タイムアウト（ミリ秒）、最後の引数: 完了時のコールバック）
+    _MARKETING_TAG_ASYNC_SCRIPT = """
+        var done = arguments[arguments.length - 1];
+        var timeoutMs = arguments[0];
+        var start = Date.now();
+        var check = function () {
+            var flags = {
+                gtm: typeof gtag !== 'undefined' || typeof dataLayer !== 'undefined',
+                ga: typeof ga !== 'undefined' || typeof gtag !== 'undefined',
+                fb: typeof fbq !== 'undefined',
+                adobe: typeof s !== 'undefined' || typeof adobe !== 'undefined'
+            };
+            if (flags.gtm || flags.ga || flags.fb || flags.adobe || Date.now() - start > timeoutMs) {
+                done(flags);
+            } else {
+                setTimeout(check, 50);
+            }
+        };
+        check();
+    """
+    
+    # ページ内の全リンクのhrefを1回のWebDriver呼び出しで取得するスクリプト
+    # （SVGの<a>はhrefが文字列ではないため属性値を使用）
+    _LINK_HREFS_SCRIPT = """
+        return Array.from(document.querySelectorAll('a[href]'), function (a) {
+            return typeof a.href === 'string' ? a.href : a.getAttribute('href');
+        });
+    """
+    
+    # 高速モードで読み込みを遮断するリソース（計測ビーコンに使われるgifは遮断しない）
+    _BLOCKED_MEDIA_URLS = [
+        '*.jpg', '*.jpeg', '*.png', '*.webp', '*.avif', '*.svg',
+        '*.mp4', '*.webm', '*.woff', '*.woff2', '*.ttf'
+    ]
+    
+    # リスタート時にChrome DevTools Protocolで削除するストレージの種類
+    _RESTART_STORAGE_TYPES = 'cookies,local_storage,session_storage,indexeddb,cache_storage,service_workers'
+    
+    # Cookie情報の表（罫線・行の書式）
+    _COOKIE_ROW_FORMAT = "│ {:<18} │ {:<28} │ {:<18} │ {:<8} │"
+    _COOKIE_TABLE_TOP = "┌" + "─" * 20 + "┬" + "─" * 30 + "┬" + "─" * 20 + "┬" + "─" * 10 + "┐"
+    _COOKIE_TABLE_HEADER = _COOKIE_ROW_FORMAT.format("Cookie名", "値", "ドメイン", "セキュア")
+    _COOKIE_TABLE_MIDDLE = "├" + "─" * 20 + "┼" + "─" * 30 + "┼" + "─" * 20 + "┼" + "─" * 10 + "┤"
+    _COOKIE_TABLE_BOTTOM = "└" + "─" * 20 + "┴" + "─" * 30 + "┴" + "─" * 20 + "┴" + "─" * 10 + "┘"
+    
+    # 複数のXPATHの要素を1回のWebDriver呼び出しでまとめて取得するスクリプト（見つからない要素はnull）
+    _XPATH_ELEMENTS_SCRIPT = """
+        return arguments[0].map(function (xpath) {
+            try {
+                return document.evaluate(xpath, document, null,
+                                         XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+            } catch (e) {
+                return null;
+            }
+        });
+    """
+    
+    # アクションの入力とクリックを1回のWebDriver呼び出しでまとめて行うスクリプト
+    # （arguments[0]: [XPATH, 値]の配列、arguments[1]: クリック対象XPATH。要素が揃わなければ何もせずfalse）
+    _ACTION_SCRIPT = """
+        var fills = arguments[0], clickXpath = arguments[1];
+        var find = function (xpath) {
+            return document.evaluate(xpath, document, null,
+                                     XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        };
+        var elements = fills.map(function (fill) { return find(fill[0]); });
+        var clickTarget = clickXpath ? find(clickXpath) : null;
+        if (elements.some(function (el) { return !el; }) ||
+                (clickXpath && (!clickTarget || clickTarget.disabled))) {
+            return false;
+        }
+        elements.forEach(function (el, i) {
+            el.focus();
+            // React等のフレームワークにも値の変更を通知できるよう、プロトタイプのsetterで設定
+            var descriptor = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(el), 'value');
+            if (descriptor && descriptor.set) {
+                descriptor.set.call(el, fills[i][1]);
+            } else {
+                el.value = fills[i][1];
+            }
+            el.dispatchEvent(new Event('input', {bubbles: true}));
+            el.dispatchEvent(new Event('change', {bubbles: true}));
+        });
+        if (clickTarget) {
+            clickTarget.click();
+        }
+        return true;
+    """
+    
+    # 一括確認で見つからなかった入力欄を待つ時間（秒、アクションごとの合計）
+    _LATE_INPUT_WAIT = 3
+    
+    # 巡回対象外のURL（ファイル拡張子・mailto等のキーワード・アンカー）
+    _INVALID_RE = re.compile(r'\.(?:pdf|jpe?g|png|gif|zip|rar|exe)$|(?:mailto|tel|javascript):|#', re.IGNORECASE)
+    _VALID_URL_CACHE_SIZE = 8192
+    
+    # 訪問済み判定で無視するトラッキング用パラメータ
+    _TRACKING_PARAMS = frozenset({
+        'utm_source', 'utm_medium', 'utm_campaign', 'utm_term', 'utm_content', 'gclid', 'fbclid'
+    })
+    _DEFAULT_PORTS = {'http': ':80', 'https': ':443'}
+    
+    # 本文を受信せずに破棄するレスポンスの上限サイズ（Content-Length、バイト）
+    _MAX_PAGE_BYTES = 5_000_000
+    
+    # フォールバック取得の再試行（一時的なエラーのみ、Retry-Afterの指定は上限秒数まで従う）
+    _RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+    _FETCH_RETRIES = 2
+    _RETRY_BACKOFF = 0.3
+    _MAX_RETRY_WAIT = 10.0
+    _FETCH_TIMEOUT = 10
+    
+    # この文字数以上のHTMLはワーカープロセスで解析（小さいページはプロセス間転送の方が高コスト）
+    _PARSER_OFFLOAD_MIN_SIZE = 200_000
+    
     def __init__(self, start_url: str, max_steps: int = 10, delay: float = 2.0, 
                  stay_in_domain: bool = True, max_links_per_page: int = 50,
                  config_file: str = "crawler_config.json", use_selenium: bool = True,
                  restart_enabled: bool = False, restart_range: str = "10-20",
-                 fast_mode: bool = True, headless: bool = False, log_cookies: bool = True):
+                 fast_mode: bool = True, headless: bool = False, log_cookies: bool = True,
+                 prefetch_count: int = 1, fetch_concurrency: int = 20, http2: bool = False,
+                 browser_pool_size: int = 1, browser_cache_dir: Optional[str] = ".crawler_cache",
+                 browser_profile_dir: Optional[str] = None, content_dedup: bool = False,
+                 parser_workers: int = 0, state_db: Optional[str] = None, parallel_workers: int = 1,
+                 quiet: bool = False, cookie_log_file: Optional[str] = "cookies.jsonl",
+                 history_file: Optional[str] = None):
         """
         Webクローラーの初期化
         
@@ -275,21 +819,46 @@ class WebCrawler:
             restart_range: リスタートステップ範囲（例：10-20）
             fast_mode: 高速モード（True）vs 安全モード（False）
             headless: ヘッドレスモード（True）vs GUI表示（False）
+            prefetch_count: フォールバック経路で先読みするリンク数（選択リンクを含む、0で無効）
+            fetch_concurrency: フォールバック経路の最大同時接続数
+            http2: フォールバック経路でaiohttpの代わりにhttpx（HTTP/2）を使うか（先読みは行わない）
+            browser_pool_size: 起動済みで保持するChromeの台数（使用中を含む）
+            browser_cache_dir: ブラウザのディスクキャッシュ保存先（Noneで永続化しない）
+            browser_profile_dir: Chromeプロファイル保存先（指定時はCookieも実行間で保持される）
+            content_dedup: 内容がほぼ同じページ（パラメータ違い等）のリンク抽出・操作を省略するか
+            parser_workers: 大きなHTMLのリンク解析に使うワーカープロセス数（0で無効。内容重複判定と並行させる場合のみ使用）
+            state_db: 訪問済みURL・履歴を保存するSQLiteファイル（指定時は前回の訪問済みURLを引き継ぐ）
+            parallel_workers: 並列に巡回するブラウザ数（各ブラウザが独立してランダム巡回し、ステップ数を分担）
+            quiet: ステップごとの進捗表示・INFOログを抑制（警告・エラーと開始時・終了時の表示のみ）
+            cookie_log_file: Cookie詳細を記録するJSON Linesファイル（Noneで記録しない、log_cookies有効時のみ）
+            history_file: 巡回・アクション・リスタート履歴を1件ずつ追記するJSON Linesファイル（Noneで記録しない、再開しない実行では空にしてから記録）
         """
         # ログ設定を最初に行う
         self._setup_logging()
+        self.quiet = quiet
+        self.logger.setLevel(logging.WARNING if quiet else logging.INFO)
+        self.console.setLevel(logging.WARNING if quiet else logging.INFO)
         
         self.start_url = start_url
         self.max_steps = max_steps
         self.delay = delay
         self.stay_in_domain = stay_in_domain
         self.max_links_per_page = max_links_per_page
-        self.use_selenium = use_selenium and SELENIUM_AVAILABLE
+        self.use_selenium = use_selenium and _ensure_selenium()
         self.restart_enabled = restart_enabled
         self.restart_range = restart_range
         self.fast_mode = fast_mode
         self.headless = headless
         self.log_cookies = log_cookies
+        self.prefetch_count = prefetch_count
+        self.fetch_concurrency = fetch_concurrency
+        self.http2 = http2
+        self.browser_pool_size = browser_pool_size
+        self.browser_cache_dir = browser_cache_dir
+        self.browser_profile_dir = browser_profile_dir
+        self.config_file = config_file
+        self.content_dedup = content_dedup
+        self.parallel_workers = max(1, parallel_workers)
         
         # リスタート設定の解析
         self.restart_min, self.restart_max = self._parse_restart_range(restart_range)
@@ -298,24 +867,77 @@ class WebCrawler:
         
         # 設定管理
         self.config_manager = ConfigManager(config_file)
+        self._valid_url_cache: Dict[str, bool] = {}
+        self._valid_url_generation = self.config_manager.generation
         
         # 開始URLのドメインを取得
         self.base_domain = urlparse(start_url).netloc
+        # 同一ドメイン判定の前段で使うURLの接頭辞（文字列比較のみで高速に除外）
+        self._allowed_prefixes = ('http://' + self.base_domain, 'https://' + self.base_domain)
         
         # 訪問履歴とリンク履歴
-        self.visited_urls: Set[str] = set()
-        self.crawl_history: List[dict] = []
+        self.visited_urls = VisitedURLSet()  # 正規化後URLのハッシュ（_url_key）
+        self.crawl_history: List[HistoryEntry] = []
         self.action_history: List[dict] = []
         self.restart_history: List[dict] = []
+        self._timestamp_second = -1
+        self._timestamp_text = ''
+        
+        # 訪問済みURL・履歴の永続化（前回の訪問済みURLがあれば再開）
+        self.state_store = CrawlStateStore(state_db) if state_db else None
+        if self.state_store is not None:
+            self.visited_urls.update(self.state_store.load_visited())
+            if self.visited_urls:
+                print(f"📂 前回の訪問済みURLを{len(self.visited_urls)}件読み込みました: {state_db}")
+        
+        # Cookie詳細ログ（ファイルは最初のCookie記録時に作成）
+        self.cookie_log = JsonLinesWriter(cookie_log_file) if log_cookies and cookie_log_file else None
+        # 履歴の逐次保存（中断・異常終了しても記録済みのステップは残る）
+        self.history_log = JsonLinesWriter(history_file) if history_file else None
+        
+        # ページ内容の近似重複判定（URL違いの同一ページを検出）
+        self.content_index = ContentFingerprintIndex() if content_dedup else None
         
         # セッション設定
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
+        # 圧縮転送を要求（brotli等はデコード可能な場合のみ）
+        self.session.headers.update(make_headers(accept_encoding=True))
+        
+        # 同一ホストへの接続を使い回し、一時的なエラーは自動リトライ
+        retry = Retry(total=self._FETCH_RETRIES, backoff_factor=self._RETRY_BACKOFF,
+                      status_forcelist=sorted(self._RETRY_STATUSES))
+        adapter = HTTPAdapter(pool_connections=20, pool_maxsize=50, max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        # HTTP/2クライアント（http2指定時のみ。同一ホストへの要求を1接続に多重化）
+        self._http2_client = self._create_http2_client() if http2 else None
+        if http2 and self._http2_client is None:
+            self.logger.warning("HTTP/2を使用できません（httpx[http2]が必要です）。通常の取得方法を使用します")
+        
+        # 非同期フェッチャー（aiohttp）: 初回のフォールバック取得時に起動
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._aio_session = None
+        self._fetch_semaphore: Optional[asyncio.BoundedSemaphore] = None
+        # ホストごとのリクエスト間隔の管理（先読みもdelay秒の間隔に従う）
+        self._host_locks: Dict[str, asyncio.Lock] = {}
+        self._host_next_request: Dict[str, float] = {}
+        self._prefetch_futures: Dict[str, concurrent.futures.Future] = {}
+        
+        # HTML解析用のワーカープロセス: 初回の大きなページ解析時に起動
+        self.parser_workers = parser_workers
+        self._parser_pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+        # 並列巡回の中断指示（並列ワーカーと共有）
+        self._stop_event = threading.Event()
         
         # Seleniumドライバー
         self.driver = None
+        self.browser_pool: Optional[BrowserPool] = None
+        self._last_loaded_url: Optional[str] = None
         if self.use_selenium:
             self._setup_selenium()
     
@@ -334,7 +956,7 @@ class WebCrawler:
                 return val, val
         except Exception as e:
             if hasattr(self, 'logger'):
-                self.logger.warning(f"リスタート範囲の解析エラー: {e}. デフォルト値(10-20)を使用します")
+                self.logger.warning("リスタート範囲の解析エラー: %s. デフォルト値(10-20)を使用します", e)
             else:
                 print(f"⚠️ リスタート範囲の解析エラー: {e}. デフォルト値(10-20)を使用します")
             return 10, 20
@@ -348,66 +970,150 @@ class WebCrawler:
     def _setup_selenium(self):
         """Selenium WebDriverの設定"""
         try:
-            chrome_options = Options()
-            
             # ヘッドレスモード設定（起動時の設定に基づく）
             if self.headless:
-                chrome_options.add_argument('--headless')
                 print("👻 ヘッドレスモード: 有効（ブラウザ非表示）")
             else:
                 print("🖥️ ヘッドレスモード: 無効（ブラウザ表示）")
             
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--window-size=1920,1080')
-            
-            # マーケティングツール用の設定
-            chrome_options.add_argument('--enable-javascript')
-            chrome_options.add_argument('--allow-running-insecure-content')
-            chrome_options.add_argument('--disable-web-security')
-            chrome_options.add_argument('--disable-features=VizDisplayCompositor')
-            
-            self.driver = webdriver.Chrome(options=chrome_options)
-            self.driver.implicitly_wait(10)
+            self.browser_pool = BrowserPool(self._create_driver, size=self.browser_pool_size)
+            self.driver = self.browser_pool.acquire()
+            self.browser_pool.replenish()
             print("✅ Selenium WebDriver準備完了（マーケティングツール対応モード）")
+            if self.browser_pool.size > 1:
+                print(f"♻️ 予備ブラウザ: {self.browser_pool.size - 1}台を起動済み")
         except Exception as e:
             print(f"⚠️ Selenium WebDriver設定エラー: {e}")
             print("ChromeDriverがインストールされていることを確認してください")
             self.use_selenium = False
     
+    def _create_driver(self, index: int):
+        """Chrome WebDriverを1台起動"""
+        chrome_options = Options()
+        
+        if self.headless:
+            chrome_options.add_argument('--headless')
+        
+        chrome_options.add_argument('--no-sandbox')
+        chrome_options.add_argument('--disable-dev-shm-usage')
+        chrome_options.add_argument('--disable-gpu')
+        chrome_options.add_argument('--window-size=1920,1080')
+        
+        # マーケティングツール用の設定
+        chrome_options.add_argument('--enable-javascript')
+        chrome_options.add_argument('--allow-running-insecure-content')
+        chrome_options.add_argument('--disable-web-security')
+        chrome_options.add_argument('--disable-features=VizDisplayCompositor')
+        
+        # 高速モードでは画像等の読み込み完了を待たない（DOMContentLoadedで制御を戻す）
+        if self.fast_mode:
+            chrome_options.page_load_strategy = 'eager'
+        
+        # キャッシュ・プロファイルの永続化（タグスクリプトや静的アセットを再利用）
+        # Chromeはディレクトリをロックするため、ドライバーごとに分ける
+        if self.browser_cache_dir:
+            cache_dir = os.path.abspath(os.path.join(self.browser_cache_dir, f"driver-{index}"))
+            chrome_options.add_argument(f'--disk-cache-dir={cache_dir}')
+        if self.browser_profile_dir:
+            profile_dir = os.path.abspath(os.path.join(self.browser_profile_dir, f"driver-{index}"))
+            chrome_options.add_argument(f'--user-data-dir={profile_dir}')
+        
+        driver = webdriver.Chrome(options=chrome_options)
+        driver.implicitly_wait(10)
+        # 非同期スクリプト（高速モードのタグ待機）の上限時間
+        driver.set_script_timeout(5)
+        if self.fast_mode:
+            self._block_media(driver)
+        return driver
+    
+    def _block_media(self, driver):
+        """画像・動画・フォントの読み込みを遮断（Chrome DevTools Protocol）"""
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self._BLOCKED_MEDIA_URLS})
+        except Exception as e:
+            self.logger.warning("メディア読み込みの遮断に失敗しました: %s", e)
+    
+    def _is_driver_alive(self) -> bool:
+        """ドライバーが応答するかチェック"""
+        try:
+            self.driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+    
+    def _replace_driver(self) -> bool:
+        """応答しなくなったドライバーをプールの予備と交換"""
+        try:
+            self.driver.quit()
+        except:
+            pass
+        
+        self._last_loaded_url = None
+        try:
+            self.driver = self.browser_pool.acquire()
+            self.browser_pool.replenish()
+            self.console.info("♻️ ブラウザを予備のドライバーと交換しました")
+            return True
+        except Exception as e:
+            self.logger.error("ドライバー交換エラー: %s", e)
+            self.driver = None
+            return False
+    
     def _setup_logging(self):
         """ログ設定"""
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler('crawler.log', encoding='utf-8'),
-                logging.StreamHandler()
-            ]
-        )
+        # 設定済みならbasicConfigは何もしないため、ハンドラ（ログファイル）も開かない
+        if not logging.getLogger().handlers:
+            logging.basicConfig(
+                level=logging.INFO,
+                format='%(asctime)s - %(levelname)s - %(message)s',
+                handlers=[
+                    logging.FileHandler('crawler.log', encoding='utf-8'),
+                    logging.StreamHandler()
+                ]
+            )
         self.logger = logging.getLogger(__name__)
+        
+        # ステップごとの進捗表示用（書式は出力する場合のみ適用される）
+        self.console = logging.getLogger(f"{__name__}.console")
+        if not self.console.handlers:
+            handler = logging.StreamHandler(sys.stdout)
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            self.console.addHandler(handler)
+            self.console.propagate = False
     
     def _is_valid_url(self, url: str) -> bool:
-        """URLの有効性をチェック"""
+        """URLの有効性をチェック（判定結果はURLごとにキャッシュし、設定の再読み込み後は判定し直す）"""
+        if self._valid_url_generation != self.config_manager.generation:
+            self._valid_url_cache.clear()
+            self._valid_url_generation = self.config_manager.generation
+        is_valid = self._valid_url_cache.get(url)
+        if is_valid is None:
+            if len(self._valid_url_cache) >= self._VALID_URL_CACHE_SIZE:
+                self._valid_url_cache.clear()
+            is_valid = self._valid_url_cache[url] = self._check_url_validity(url)
+        return is_valid
+    
+    def _check_url_validity(self, url: str) -> bool:
+        """URLの有効性を判定"""
         try:
-            parsed = urlparse(url)
-            if not parsed.scheme or not parsed.netloc:
+            # 除外するファイル拡張子・キーワード
+            if self._INVALID_RE.search(url):
                 return False
             
-            # 同一ドメイン制限
-            if self.stay_in_domain and parsed.netloc != self.base_domain:
+            # 同一ドメイン制限（接頭辞が一致しないURLはパースせずに除外）
+            if self.stay_in_domain and not url.startswith(self._allowed_prefixes):
                 return False
             
-            # 除外するファイル拡張子
-            excluded_extensions = ['.pdf', '.jpg', '.jpeg', '.png', '.gif', '.zip', '.rar', '.exe']
-            if any(url.lower().endswith(ext) for ext in excluded_extensions):
-                return False
-            
-            # 除外するキーワード
-            excluded_keywords = ['mailto:', 'tel:', 'javascript:', '#']
-            if any(keyword in url.lower() for keyword in excluded_keywords):
-                return False
+            # 接頭辞の直後でホスト部が終わっていれば同一ドメインが確定するためパースを省略
+            if not (self.stay_in_domain and self._ends_at_host(url)):
+                parsed = urlparse(url)
+                if not parsed.scheme or not parsed.netloc:
+                    return False
+                
+                # 同一ドメイン制限（ポート・ユーザー情報付き等の例外的なURL）
+                if self.stay_in_domain and parsed.netloc != self.base_domain:
+                    return False
             
             # 設定ファイルの除外パターンをチェック
             if self._is_ignored_url(url):
@@ -417,63 +1123,62 @@ class WebCrawler:
         except Exception:
             return False
     
+    def _ends_at_host(self, url: str) -> bool:
+        """許可された接頭辞の直後でURLのホスト部が終わっているか（/・?・終端のいずれかが続く）"""
+        host_end = len(self._allowed_prefixes[0]) if url.startswith('http:') else len(self._allowed_prefixes[1])
+        return host_end == len(url) or url[host_end] in '/?'
+    
+    @classmethod
+    def _canonicalize(cls, url: str) -> str:
+        """訪問済み判定用にURLを正規化（表記揺れ・フラグメント・トラッキングパラメータを除去）"""
+        parsed = urlparse(url)
+        scheme = parsed.scheme.lower()
+        
+        host = parsed.netloc.lower()
+        default_port = cls._DEFAULT_PORTS.get(scheme)
+        if default_port and host.endswith(default_port):
+            host = host[:-len(default_port)]
+        
+        path = re.sub(r'/+', '/', parsed.path).rstrip('/') or '/'
+        query = urlencode(sorted(
+            (key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+            if key not in cls._TRACKING_PARAMS
+        ))
+        return urlunparse((scheme, host, path, parsed.params, query, ''))
+    
+    def _url_key(self, url: str) -> Tuple[int, str]:
+        """訪問済み判定用のキー（正規化後URLの64bitハッシュと正規化後URL）"""
+        canonical_url = self._canonicalize(url)
+        encoded_url = canonical_url.encode('utf-8')
+        if XXHASH_AVAILABLE:
+            return xxhash.xxh3_64_intdigest(encoded_url), canonical_url
+        return int.from_bytes(hashlib.blake2b(encoded_url, digest_size=8).digest(), 'big'), canonical_url
+    
+    def _is_visited(self, url: str) -> bool:
+        """訪問済みURLか判定（正規化後のURLで比較）"""
+        return self.visited_urls.contains(*self._url_key(url))
+    
+    def _mark_visited(self, url: str):
+        """訪問済みURLに追加（正規化後URLのハッシュで保持）"""
+        url_key, canonical_url = self._url_key(url)
+        self.visited_urls.add(url_key, canonical_url)
+        if self.state_store is not None:
+            self.state_store.add_visited(url_key)
+    
     def _is_ignored_url(self, url: str) -> bool:
         """設定ファイルの除外パターンにマッチするかチェック"""
         try:
-            ignore_patterns = self.config_manager.config.get('ignore_patterns', [])
-            url_lower = url.lower()
-            
-            for pattern_config in ignore_patterns:
-                # enabledがFalseの場合はスキップ
-                if not pattern_config.get('enabled', True):
-                    continue
-                
-                pattern = pattern_config.get('pattern', '').lower()
-                pattern_type = pattern_config.get('type', 'contains')  # デフォルトは部分一致
-                
-                if not pattern:
-                    continue
-                
-                is_match = False
-                
-                # パターンタイプに応じてマッチング
-                if pattern_type == 'contains':
-                    # 部分一致（デフォルト）
-                    is_match = pattern in url_lower
-                elif pattern_type == 'exact':
-                    # 完全一致
-                    is_match = url_lower == pattern
-                elif pattern_type == 'startswith':
-                    # 前方一致
-                    is_match = url_lower.startswith(pattern)
-                elif pattern_type == 'endswith':
-                    # 後方一致
-                    is_match = url_lower.endswith(pattern)
-                elif pattern_type == 'regex':
-                    # 正規表現
-                    try:
-                        import re
-                        is_match = re.search(pattern, url_lower) is not None
-                    except re.error as e:
-                        self.logger.warning(f"正規表現エラー: {pattern} - {e}")
-                        continue
-                elif pattern_type == 'wildcard':
-                    # ワイルドカード（*と?をサポート）
-                    try:
-                        import fnmatch
-                        is_match = fnmatch.fnmatch(url_lower, pattern)
-                    except Exception as e:
-                        self.logger.warning(f"ワイルドカードエラー: {pattern} - {e}")
-                        continue
-                
-                if is_match:
-                    description = pattern_config.get('description', '不明')
-                    self.logger.info(f"🚫 除外パターンマッチ [{pattern_type}]: {pattern} ({description}) - {url}")
-                    return True
+            pattern_config = self.config_manager.match_ignore_pattern(url)
+            if pattern_config is None:
+                return False
             
-            return False
+            pattern_type = pattern_config.get('type', 'contains')
+            pattern = pattern_config.get('pattern', '')
+            description = pattern_config.get('description', '不明')
+            self.logger.info("🚫 除外パターンマッチ [%s]: %s (%s) - %s", pattern_type, pattern, description, url)
+            return True
         except Exception as e:
-            self.logger.warning(f"除外パターンチェックエラー: {e}")
+            self.logger.warning("除外パターンチェックエラー: %s", e)
             return False
     
     def _fetch_page_with_js(self, url: str) -> Optional[str]:
@@ -482,8 +1187,21 @@ class WebCrawler:
             # fallback to requests
             return self._fetch_page_fallback(url)
         
+        if self._load_page_with_js(url):
+            try:
+                return self.driver.page_source
+            except Exception as e:
+                self.logger.error("Seleniumページ取得エラー: %s", e)
+        # fallback to requests
+        return self._fetch_page_fallback(url)
+    
+    def _load_page_with_js(self, url: str) -> bool:
+        """SeleniumでページとJavaScriptを完全実行（HTMLは転送しない）"""
+        if not self.use_selenium or not self.driver:
+            return False
+        
         try:
-            self.logger.info(f"ページ取得中（JS実行）: {url}")
+            self.logger.info("ページ取得中（JS実行）: %s", url)
             self.driver.get(url)
             
             if self.fast_mode:
@@ -498,19 +1216,23 @@ class WebCrawler:
                 self._wait_for_marketing_tags_safe()
                 time.sleep(1)
             
-            return self.driver.page_source
+            # 直後のページ操作で再読み込みせずにDOMを再利用するため記録
+            self._last_loaded_url = url
+            return True
         
         except Exception as e:
-            self.logger.error(f"Seleniumページ取得エラー: {e}")
-            # fallback to requests
-            return self._fetch_page_fallback(url)
+            self.logger.error("Seleniumページ取得エラー: %s", e)
+            self._last_loaded_url = None
+            if self.browser_pool and not self._is_driver_alive():
+                self._replace_driver()
+            return False
     
     def _wait_for_javascript_completion_fast(self):
         """JavaScript実行完了を待機（高速版）"""
         try:
-            # DOM読み込み完了を待機（タイムアウト短縮）
+            # DOM構築完了を待機（タイムアウト短縮、画像等の読み込み完了は待たない）
             WebDriverWait(self.driver, 5).until(  # 10秒 → 5秒に短縮
-                lambda driver: driver.execute_script("return document.readyState") == "complete"
+                lambda driver: driver.execute_script("return document.readyState") != "loading"
             )
             
             # jQueryが存在する場合はAjax完了を待機（タイムアウト短縮）
@@ -525,54 +1247,35 @@ class WebCrawler:
             self.logger.warning("JavaScript実行完了の待機がタイムアウトしました（高速モード）")
     
     def _wait_for_marketing_tags_fast(self):
-        """マーケティングタグの読み込み完了を待機（高速・並列版）"""
+        """マーケティングタグの読み込み完了を待機（高速版：ブラウザ内で待機し1回の呼び出しで判定）"""
         try:
-            # 全タグを並列チェック（タイムアウト大幅短縮）
-            start_time = time.time()
-            timeout = 3  # 全体で3秒以内
+            # いずれかのタグが現れた時点で結果が返る（全体で3秒以内）
+            flags = self.driver.execute_async_script(self._MARKETING_TAG_ASYNC_SCRIPT, 2800) or {}
             
             detected_tags = []
             
-            while time.time() - start_time < timeout:
-                # Google Tag Manager / Analytics チェック
-                try:
-                    if self.driver.execute_script(
-                        "return typeof gtag !== 'undefined' || typeof dataLayer !== 'undefined' || typeof ga !== 'undefined'"
-                    ):
-                        if 'GTM/GA' not in detected_tags:
-                            detected_tags.append('GTM/GA')
-                            print("    📊 Google Tag Manager/Analytics検出")
-                except:
-                    pass
-                
-                # Facebook Pixel チェック
-                try:
-                    if self.driver.execute_script("return typeof fbq !== 'undefined'"):
-                        if 'Facebook' not in detected_tags:
-                            detected_tags.append('Facebook')
-                            print("    📘 Facebook Pixel検出")
-                except:
-                    pass
-                
-                # Adobe Analytics チェック
-                try:
-                    if self.driver.execute_script(
-                        "return typeof s !== 'undefined' || typeof adobe !== 'undefined'"
-                    ):
-                        if 'Adobe' not in detected_tags:
-                            detected_tags.append('Adobe')
-                            print("    🅰️ Adobe Analytics検出")
-                except:
-                    pass
-                
-                # 短時間スリープ
-                time.sleep(0.1)
+            # Google Tag Manager / Analytics チェック
+            if flags.get('gtm') or flags.get('ga'):
+                detected_tags.append('GTM/GA')
+                self.console.info("    📊 Google Tag Manager/Analytics検出")
+            
+            # Facebook Pixel チェック
+            if flags.get('fb'):
+                detected_tags.append('Facebook')
+                self.console.info("    📘 Facebook Pixel検出")
+            
+            # Adobe Analytics チェック
+            if flags.get('adobe'):
+                detected_tags.append('Adobe')
+                self.console.info("    🅰️ Adobe Analytics検出")
             
             if not detected_tags:
-                print("    ⚡ タグ検出タイムアウト（高速モード）")
+                self.console.info("    ⚡ タグ検出タイムアウト（高速モード）")
                 
+        except TimeoutException:
+            self.console.info("    ⚡ タグ検出タイムアウト（高速モード）")
         except Exception as e:
-            self.logger.warning(f"マーケティングタグ検出エラー: {e}")
+            self.logger.warning("マーケティングタグ検出エラー: %s", e)
     
     def _wait_for_javascript_completion_safe(self):
         """JavaScript実行完了を待機（安全モード：元の処理）"""
@@ -594,131 +1297,357 @@ class WebCrawler:
             self.logger.warning("JavaScript実行完了の待機がタイムアウトしました（安全モード）")
     
     def _wait_for_marketing_tags_safe(self):
-        """マーケティングタグの読み込み完了を待機（安全モード：元の処理）"""
+        """マーケティングタグの読み込み完了を待機（安全モード：全タグを個別に判定）"""
+        tag_messages = [
+            ('gtm', "    📊 Google Tag Manager検出"),
+            ('ga', "    📈 Google Analytics検出"),
+            ('fb', "    📘 Facebook Pixel検出"),
+            ('adobe', "    🅰️ Adobe Analytics検出"),
+        ]
+        detected = set()
+        
+        def all_tags_detected(driver) -> bool:
+            flags = driver.execute_script(self._MARKETING_TAG_SCRIPT) or {}
+            for key, message in tag_messages:
+                if flags.get(key) and key not in detected:
+                    detected.add(key)
+                    self.console.info(message)
+            return len(detected) == len(tag_messages)
+        
         try:
-            # Google Tag Manager の読み込み待機
-            try:
-                WebDriverWait(self.driver, 5).until(
-                    lambda driver: driver.execute_script(
-                        "return typeof gtag !== 'undefined' || typeof dataLayer !== 'undefined'"
-                    )
-                )
-                print("    📊 Google Tag Manager検出")
-            except TimeoutException:
-                pass
-            
-            # Google Analytics の読み込み待機
+            # 1回のスクリプト実行で全タグを判定し、全て揃うか5秒経過するまで待機
+            WebDriverWait(self.driver, 5, poll_frequency=0.5).until(all_tags_detected)
+        except TimeoutException:
+            pass
+        except Exception as e:
+            self.logger.warning("マーケティングタグ検出エラー: %s", e)
+    
+    def _fetch_page_fallback(self, url: str) -> Optional[str]:
+        """フォールバック用：http2指定時はhttpx、それ以外はaiohttp（未インストール時はrequests）でページ取得"""
+        if self._http2_client is not None:
+            return self._fetch_page_http2(url)
+        
+        if self._start_async_fetcher():
+            future = self._take_prefetched(url)
+            if future is not None:
+                self.logger.info("フォールバック：先読み済みページを使用: %s", url)
+            else:
+                self.logger.info("フォールバック：aiohttp でページ取得: %s", url)
+                future = asyncio.run_coroutine_threadsafe(self._fetch_one(url), self._loop)
+            # 再試行とその待機、同一ホストの間隔待ちを含めた上限時間
+            timeout = ((self._FETCH_RETRIES + 1) * (self._FETCH_TIMEOUT + self.delay)
+                       + self._FETCH_RETRIES * self._MAX_RETRY_WAIT)
             try:
-                WebDriverWait(self.driver, 3).until(
-                    lambda driver: driver.execute_script(
-                        "return typeof ga !== 'undefined' || typeof gtag !== 'undefined'"
-                    )
-                )
-                print("    📈 Google Analytics検出")
-            except TimeoutException:
-                pass
-            
-            # Facebook Pixel の読み込み待機
+                return future.result(timeout=timeout)
+            except Exception as e:
+                future.cancel()
+                self.logger.error("フォールバックページ取得エラー: %s", e)
+                return None
+        
+        try:
+            self.logger.info("フォールバック：requests でページ取得: %s", url)
+            # ヘッダーだけを先に受信し、HTML以外は本文を読まずに接続を閉じる
+            with self.session.get(url, timeout=self._FETCH_TIMEOUT, stream=True) as response:
+                response.raise_for_status()
+                if not self._is_html_response(response.headers):
+                    return None
+                return response.text
+        
+        except requests.exceptions.RequestException as e:
+            self.logger.error("フォールバックページ取得エラー: %s", e)
+            return None
+    
+    def _create_http2_client(self):
+        """HTTP/2対応のhttpxクライアントを生成（httpx・h2が無い場合はNone）"""
+        if not HTTPX_AVAILABLE:
+            return None
+        try:
+            return httpx.Client(
+                http2=True,
+                headers={'User-Agent': self.session.headers['User-Agent']},
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+                timeout=10.0,
+                follow_redirects=True
+            )
+        except ImportError:
+            # http2=Trueにはh2パッケージが必要
+            return None
+    
+    def _fetch_page_http2(self, url: str) -> Optional[str]:
+        """httpx（HTTP/2）でページ取得（HTML以外は本文を読まずに破棄、429・5xx・接続エラーは再試行）"""
+        self.logger.info("フォールバック：httpx（HTTP/2）でページ取得: %s", url)
+        for attempt in range(self._FETCH_RETRIES + 1):
             try:
-                WebDriverWait(self.driver, 3).until(
-                    lambda driver: driver.execute_script("return typeof fbq !== 'undefined'")
-                )
-                print("    📘 Facebook Pixel検出")
-            except TimeoutException:
-                pass
-            
-            # Adobe Analytics の読み込み待機
+                with self._http2_client.stream('GET', url) as response:
+                    if response.status_code in self._RETRY_STATUSES and attempt < self._FETCH_RETRIES:
+                        wait = self._retry_wait(attempt, response.headers.get('Retry-After'))
+                        self.logger.warning("フォールバックページ取得を再試行します: %s - HTTP %d（%.1f秒後）",
+                                            url, response.status_code, wait)
+                    else:
+                        response.raise_for_status()
+                        if not self._is_html_response(response.headers):
+                            return None
+                        response.read()
+                        return response.text
+            
+            except httpx.TransportError as e:
+                if attempt >= self._FETCH_RETRIES:
+                    self.logger.error("フォールバックページ取得エラー: %s - %s", url, e)
+                    return None
+                wait = self._retry_wait(attempt)
+                self.logger.warning("フォールバックページ取得を再試行します: %s - %s（%.1f秒後）", url, e, wait)
+            except (httpx.HTTPError, httpx.InvalidURL, httpx.StreamError, httpx.CookieConflict) as e:
+                # InvalidURL等はHTTPErrorのサブクラスではない
+                self.logger.error("フォールバックページ取得エラー: %s - %s", url, e)
+                return None
+            time.sleep(wait)
+        return None
+    
+    def _is_html_response(self, headers) -> bool:
+        """レスポンスヘッダーから取得対象のHTMLか判定（Content-Type・Content-Length）"""
+        # Content-Typeをチェック
+        content_type = headers.get('content-type', '').lower()
+        if 'text/html' not in content_type:
+            self.logger.warning("HTMLではないコンテンツ: %s", content_type)
+            return False
+        
+        # 巨大なレスポンスは本文を受信しない
+        try:
+            content_length = int(headers.get('content-length', 0))
+        except ValueError:
+            content_length = 0
+        if content_length > self._MAX_PAGE_BYTES:
+            self.logger.warning("サイズが大きすぎるため取得を省略: %dバイト", content_length)
+            return False
+        
+        return True
+    
+    def _start_async_fetcher(self) -> bool:
+        """aiohttp用のイベントループをバックグラウンドスレッドで起動"""
+        if not AIOHTTP_AVAILABLE:
+            return False
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            self._loop_thread = threading.Thread(
+                target=self._loop.run_forever, name='crawler-fetch-loop', daemon=True
+            )
+            self._loop_thread.start()
+        return True
+    
+    async def _get_aio_session(self):
+        """クロール全体で共有するaiohttpセッションを取得（ループ内で生成）"""
+        if self._aio_session is None:
+            connector = aiohttp.TCPConnector(limit=self.fetch_concurrency, keepalive_timeout=30)
+            self._aio_session = aiohttp.ClientSession(
+                connector=connector,
+                headers={'User-Agent': self.session.headers['User-Agent']},
+                timeout=aiohttp.ClientTimeout(total=self._FETCH_TIMEOUT)
+            )
+            self._fetch_semaphore = asyncio.BoundedSemaphore(self.fetch_concurrency)
+            self._host_locks.clear()
+            self._host_next_request.clear()
+        return self._aio_session
+    
+    async def _wait_for_host_slot(self, url: str):
+        """同じホストへのリクエスト開始をdelay秒以上空ける（先読みで巡回の待機時間を飛ばさない）"""
+        if self.delay <= 0:
+            return
+        host = _netloc(url)
+        lock = self._host_locks.get(host)
+        if lock is None:
+            lock = self._host_locks[host] = asyncio.Lock()
+        async with lock:
+            loop = asyncio.get_running_loop()
+            wait = self._host_next_request.get(host, 0.0) - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._host_next_request[host] = loop.time() + self.delay
+    
+    def _retry_wait(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """再試行までの待機秒数（Retry-Afterがあればそれに従い、なければ指数バックオフ）"""
+        if retry_after:
             try:
-                WebDriverWait(self.driver, 3).until(
-                    lambda driver: driver.execute_script(
-                        "return typeof s !== 'undefined' || typeof adobe !== 'undefined'"
-                    )
-                )
-                print("    🅰️ Adobe Analytics検出")
-            except TimeoutException:
-                pass
+                wait = float(retry_after)
+            except ValueError:
+                try:
+                    retry_at = parsedate_to_datetime(retry_after)
+                    if retry_at.tzinfo is None:
+                        retry_at = retry_at.replace(tzinfo=timezone.utc)
+                    wait = (retry_at - datetime.now(timezone.utc)).total_seconds()
+                except (TypeError, ValueError):
+                    wait = None
+            if wait is not None:
+                return min(max(wait, 0.0), self._MAX_RETRY_WAIT)
+        return self._RETRY_BACKOFF * (2 ** attempt)
+    
+    async def _fetch_one(self, url: str) -> Optional[str]:
+        """aiohttpで1ページ取得（HTML以外はNone、429・5xx・接続エラーは再試行）"""
+        session = await self._get_aio_session()
+        for attempt in range(self._FETCH_RETRIES + 1):
+            await self._wait_for_host_slot(url)
+            async with self._fetch_semaphore:
+                try:
+                    async with session.get(url) as response:
+                        if response.status in self._RETRY_STATUSES and attempt < self._FETCH_RETRIES:
+                            wait = self._retry_wait(attempt, response.headers.get('Retry-After'))
+                            self.logger.warning("フォールバックページ取得を再試行します: %s - HTTP %d（%.1f秒後）",
+                                                url, response.status, wait)
+                        else:
+                            response.raise_for_status()
+                            # 本文の受信前にヘッダーで判定（対象外なら本文を読まずに破棄）
+                            if not self._is_html_response(response.headers):
+                                return None
+                            return await response.text(errors='replace')
                 
-        except Exception as e:
-            self.logger.warning(f"マーケティングタグ検出エラー: {e}")
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                    if attempt >= self._FETCH_RETRIES:
+                        self.logger.error("フォールバックページ取得エラー: %s - %s", url, e)
+                        return None
+                    wait = self._retry_wait(attempt)
+                    self.logger.warning("フォールバックページ取得を再試行します: %s - %s（%.1f秒後）", url, e, wait)
+                except aiohttp.ClientError as e:
+                    self.logger.error("フォールバックページ取得エラー: %s - %s", url, e)
+                    return None
+            # 待機中は同時接続数の枠を空けておく
+            await asyncio.sleep(wait)
+        return None
     
-    def _fetch_page_fallback(self, url: str) -> Optional[str]:
-        """フォールバック用：従来のrequests方式"""
+    def _prefetch_links(self, urls: List[str]):
+        """次に訪問する候補リンクを先読み（同じホストへはdelay秒の間隔を空けて取得し、待機中に受信を進める）"""
+        if self.prefetch_count <= 0 or self._http2_client is not None or not self._start_async_fetcher():
+            return
+        
+        for url in urls[:self.prefetch_count]:
+            if url not in self._prefetch_futures:
+                self._prefetch_futures[url] = asyncio.run_coroutine_threadsafe(self._fetch_one(url), self._loop)
+    
+    def _take_prefetched(self, url: str) -> Optional[concurrent.futures.Future]:
+        """先読み結果を取り出し、使われなかった先読みは破棄"""
+        future = self._prefetch_futures.pop(url, None)
+        self._cancel_prefetches()
+        return future
+    
+    def _cancel_prefetches(self):
+        """未使用の先読みをすべて破棄"""
+        for stale in self._prefetch_futures.values():
+            stale.cancel()
+        self._prefetch_futures.clear()
+    
+    def _close_async_fetcher(self):
+        """aiohttpセッションとイベントループを終了"""
+        if self._loop is None:
+            return
         try:
-            self.logger.info(f"フォールバック：requests でページ取得: {url}")
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            
-            # Content-Typeをチェック
-            content_type = response.headers.get('content-type', '').lower()
-            if 'text/html' not in content_type:
-                self.logger.warning(f"HTMLではないコンテンツ: {content_type}")
-                return None
+            self._cancel_prefetches()
+            if self._aio_session is not None:
+                asyncio.run_coroutine_threadsafe(self._aio_session.close(), self._loop).result(timeout=5)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        except Exception:
+            pass
+        self._aio_session = None
+        self._loop = None
+    
+    def _extract_links_from_selenium(self, current_url: str) -> Tuple[int, List[str]]:
+        """Seleniumからリンクを抽出し、(有効リンク数, 選択候補)を返す（JavaScript生成リンクも取得可能）"""
+        try:
+            # JavaScript実行後のリンクを1回のスクリプト実行でまとめて取得
+            hrefs = self.driver.execute_script(self._LINK_HREFS_SCRIPT) or []
             
-            return response.text
+            # 相対URLを絶対URLに変換
+            absolute_urls = (
+                urljoin(current_url, href.strip())
+                for href in hrefs if href and isinstance(href, str)
+            )
+            # 次に進むリンクは1件あれば足りる（重複ページ時の選び直し用に候補が要る場合のみ複数保持）
+            sample_size = self.max_links_per_page if self.content_dedup else 1
+            return self._sample_links(absolute_urls, sample_size)
         
-        except requests.exceptions.RequestException as e:
-            self.logger.error(f"フォールバックページ取得エラー: {e}")
-            return None
+        except Exception as e:
+            self.logger.error("Seleniumリンク抽出エラー: %s", e)
+            return 0, []
     
-    def _extract_links_from_selenium(self, current_url: str) -> List[str]:
-        """Seleniumからリンクを抽出（JavaScript生成リンクも取得可能）"""
+    def _extract_links(self, html: str, current_url: str,
+                       hrefs_future: Optional[concurrent.futures.Future] = None) -> Tuple[int, List[str]]:
+        """HTMLからリンクを抽出し、(有効リンク数, 選択候補)を返す（フォールバック用）"""
         try:
-            links = []
-            
-            # JavaScript実行後のリンクを取得
-            link_elements = self.driver.find_elements(By.TAG_NAME, "a")
-            
-            for element in link_elements:
+            hrefs: Optional[Iterable[str]] = None
+            if hrefs_future is not None:
                 try:
-                    href = element.get_attribute("href")
-                    if href:
-                        # 相対URLを絶対URLに変換
-                        absolute_url = urljoin(current_url, href.strip())
-                        
-                        # URLの有効性をチェック
-                        if self._is_valid_url(absolute_url) and absolute_url not in self.visited_urls:
-                            links.append(absolute_url)
-                except Exception:
-                    continue  # 個別のリンク取得エラーは無視
-            
-            # 重複を除去し、制限数まで削る
-            unique_links = list(set(links))
-            if len(unique_links) > self.max_links_per_page:
-                unique_links = random.sample(unique_links, self.max_links_per_page)
+                    hrefs = hrefs_future.result()
+                except Exception as e:
+                    self.logger.warning("ワーカープロセスでのHTML解析に失敗（メインプロセスで再解析）: %s", e)
+            if hrefs is None:
+                hrefs = _parse_hrefs(html, current_url)
             
-            return unique_links
+            # ランダム選択の母集団として十分な数が集まったら打ち切る
+            # 選択候補以外は先読み対象として使う
+            return self._sample_links(hrefs, self.max_links_per_page, self.max_links_per_page * 4)
         
         except Exception as e:
-            self.logger.error(f"Seleniumリンク抽出エラー: {e}")
-            return []
+            self.logger.error("HTMLリンク抽出エラー: %s", e)
+            return 0, []
     
-    def _extract_links(self, html: str, current_url: str) -> List[str]:
-        """HTMLからリンクを抽出（フォールバック用）"""
+    def _submit_link_parsing(self, html: Optional[str], current_url: str) -> Optional[concurrent.futures.Future]:
+        """大きなHTMLのhref解析をワーカープロセスに投入（対象外ならNone）"""
+        # 並行して行う処理（内容の重複判定）がなければ、プロセス間転送の分だけ同期解析より遅くなる
+        if (not html or self.parser_workers <= 0 or not self.content_dedup
+                or len(html) < self._PARSER_OFFLOAD_MIN_SIZE):
+            return None
+        
         try:
-            soup = BeautifulSoup(html, 'html.parser')
-            links = []
-            
-            # aタグのhref属性を取得
-            for a_tag in soup.find_all('a', href=True):
-                href = a_tag['href'].strip()
-                
-                # 相対URLを絶対URLに変換
-                absolute_url = urljoin(current_url, href)
-                
-                # URLの有効性をチェック
-                if self._is_valid_url(absolute_url) and absolute_url not in self.visited_urls:
-                    links.append(absolute_url)
+            if self._parser_pool is None:
+                # aiohttp・Seleniumのスレッドが動いているため、forkではなくspawnで起動する（子プロセスのデッドロック防止）
+                self._parser_pool = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.parser_workers, mp_context=multiprocessing.get_context('spawn')
+                )
+            allowed_prefixes = self._allowed_prefixes if self.stay_in_domain else None
+            return self._parser_pool.submit(_collect_hrefs, html, current_url, self._INVALID_RE, allowed_prefixes,
+                                            self.max_links_per_page * 4)
+        except Exception as e:
+            self.logger.warning("HTML解析ワーカーを利用できません: %s", e)
+            self.parser_workers = 0
+            return None
+    
+    def _close_parser_pool(self):
+        """HTML解析用のワーカープロセスを終了"""
+        if self._parser_pool is not None:
+            self._parser_pool.shutdown(wait=False, cancel_futures=True)
+            self._parser_pool = None
+    
+    def _sample_links(self, absolute_urls: Iterable[str], sample_size: int,
+                      max_candidates: Optional[int] = None) -> Tuple[int, List[str]]:
+        """有効な未訪問リンクから最大sample_size件を一様に抽出し、(有効リンク数, 抽出結果)を返す（リザーバサンプリング）"""
+        reservoir: List[str] = []
+        seen = set()
+        candidate_count = 0
+        
+        for absolute_url in absolute_urls:
+            # URLの有効性をチェック（正規化後のURLで重複・訪問済みを除外）
+            if not self._is_valid_url(absolute_url):
+                continue
+            url_key, canonical_url = self._url_key(absolute_url)
+            if url_key in seen or self.visited_urls.contains(url_key, canonical_url):
+                continue
+            seen.add(url_key)
             
-            # 重複を除去し、制限数まで削る
-            unique_links = list(set(links))
-            if len(unique_links) > self.max_links_per_page:
-                unique_links = random.sample(unique_links, self.max_links_per_page)
+            if candidate_count < sample_size:
+                reservoir.append(absolute_url)
+            else:
+                index = random.randrange(candidate_count + 1)
+                if index < sample_size:
+                    reservoir[index] = absolute_url
+            candidate_count += 1
             
-            return unique_links
+            if max_candidates is not None and candidate_count >= max_candidates:
+                break
         
-        except Exception as e:
-            self.logger.error(f"HTMLリンク抽出エラー: {e}")
-            return []
+        return candidate_count, reservoir
+    
+    def _is_duplicate_content(self, html: Optional[str]) -> bool:
+        """既訪問ページとほぼ同じ内容か判定（未訪問なら指紋を登録）"""
+        if self.content_index is None or not html:
+            return False
+        return self.content_index.check_and_add(ContentFingerprintIndex.simhash(html))
     
     def _get_input_value(self, input_config: Dict[str, Any]) -> Optional[str]:
         """入力値を取得（固定値、ランダム値、リスト参照をサポート）"""
@@ -731,7 +1660,7 @@ class WebCrawler:
             random_values = input_config['random_values']
             if isinstance(random_values, list) and random_values:
                 selected_value = random.choice(random_values)
-                print(f"    🎲 ランダム選択: {selected_value} (選択肢数: {len(random_values)})")
+                self.console.info("    🎲 ランダム選択: %s (選択肢数: %d)", selected_value, len(random_values))
                 return str(selected_value)
         
         # 3. word_listsからの参照が指定されている場合
@@ -742,15 +1671,106 @@ class WebCrawler:
                 word_list = word_lists[list_name]
                 if isinstance(word_list, list) and word_list:
                     selected_value = random.choice(word_list)
-                    print(f"    🎲 リスト'{list_name}'から選択: {selected_value} (選択肢数: {len(word_list)})")
+                    self.console.info("    🎲 リスト'%s'から選択: %s (選択肢数: %d)", list_name, selected_value, len(word_list))
                     return str(selected_value)
                 else:
-                    print(f"    ⚠️ リスト'{list_name}'が空または無効です")
+                    self.console.warning("    ⚠️ リスト'%s'が空または無効です", list_name)
             else:
-                print(f"    ⚠️ リスト'{list_name}'が見つかりません")
+                self.console.warning("    ⚠️ リスト'%s'が見つかりません", list_name)
         
         return None
     
+    def _locate_elements(self, xpaths: List[str]) -> Optional[Dict[str, Any]]:
+        """複数のXPATHの要素を1回のスクリプト実行で取得（見つからなかったXPATHは含めない、取得自体に失敗した場合はNone）"""
+        if not xpaths:
+            return {}
+        
+        try:
+            elements = self.driver.execute_script(self._XPATH_ELEMENTS_SCRIPT, xpaths) or []
+        except Exception as e:
+            self.logger.warning("要素の一括取得エラー（個別に待機します）: %s", e)
+            return None
+        return {xpath: element for xpath, element in zip(xpaths, elements) if element is not None}
+    
+    def _wait_for_action_targets(self, actions: List[Dict[str, Any]]):
+        """操作対象の最初の要素が現れるまで待機（固定時間のスリープの代わり）"""
+        action = next((action for action in actions if action.get('_first_input_present')), None)
+        if action is None:
+            return
+        
+        locator = action['_first_input_locator']
+        try:
+            WebDriverWait(self.driver, 5).until(action['_first_input_present'])
+        except TimeoutException:
+            self.logger.warning("操作対象要素の待機がタイムアウトしました: %s", locator[1])
+    
+    def _perform_action_script(self, action: Dict[str, Any], input_values: Dict[int, Optional[str]]) -> Optional[int]:
+        """入力とクリックを1回のスクリプト実行で行い、入力件数を返す（実行できなければNone）
+        
+        決定した入力値はinput_values（inputsの添字→値）に記録し、要素ごとの実行に切り替えた場合も同じ値を使う
+        """
+        fills = []
+        for index, input_config in enumerate(action.get('inputs', [])):
+            if not input_config.get('xpath'):
+                continue
+            if not input_config.get('_locator'):
+                return None
+            value = input_values[index] = self._get_input_value(input_config)
+            if value is None:
+                return None
+            fills.append((input_config, str(value)))
+        
+        click_xpath = action.get('click_element')
+        if click_xpath and action.get('_click_locator') is None:
+            return None
+        
+        previous_url = self.driver.current_url if click_xpath and action.get('wait_for_url_change') else None
+        try:
+            done = self.driver.execute_script(
+                self._ACTION_SCRIPT, [[input_config['xpath'], value] for input_config, value in fills], click_xpath
+            )
+        except Exception as e:
+            self.logger.warning("一括操作スクリプトエラー（要素ごとに実行します）: %s", e)
+            return None
+        if not done:
+            return None
+        
+        for input_config, value in fills:
+            self.console.info("  ✅ 入力完了: %s = %s", input_config.get('description', ''), value)
+        if click_xpath:
+            self.console.info("  ✅ クリック完了: %s", click_xpath)
+            # クリック後の待機
+            self._wait_after_click(action, previous_url)
+        return len(fills)
+    
+    def _wait_for_late_input(self, input_config: Dict[str, Any], deadline: float) -> Optional[Any]:
+        """一括確認で見つからなかった入力欄が現れるまで期限まで待機（現れなければNone）"""
+        timeout = deadline - time.monotonic()
+        if timeout <= 0:
+            return None
+        try:
+            return WebDriverWait(self.driver, timeout).until(input_config['_present'])
+        except TimeoutException:
+            return None
+    
+    def _wait_after_click(self, action: Dict[str, Any], previous_url: Optional[str]):
+        """クリック後の待機（URL変化・要素出現の指定があればその条件、なければ固定時間）"""
+        if not action.get('wait_for_url_change') and not action.get('_wait_present'):
+            time.sleep(action.get('wait_after_click', 3))
+            return
+        
+        # 条件指定時のwait_after_clickは待機の上限時間
+        timeout = action.get('wait_after_click', 1)
+        try:
+            wait = WebDriverWait(self.driver, timeout)
+            if action.get('wait_for_url_change'):
+                wait.until(EC.url_changes(previous_url))
+            if action.get('_wait_present'):
+                wait.until(action['_wait_present'])
+            wait.until(lambda driver: driver.execute_script("return document.readyState") == "complete")
+        except TimeoutException:
+            self.console.warning("  ⚠️ クリック後の待機がタイムアウトしました（%s秒）", timeout)
+    
     def _perform_page_actions(self, url: str) -> bool:
         """ページ操作を実行"""
         if not self.use_selenium or not self.driver:
@@ -761,150 +1781,213 @@ class WebCrawler:
             return False
         
         try:
-            # ページをSeleniumで読み込み
-            self.driver.get(url)
-            time.sleep(2)  # ページ読み込み待機
+            # 読み込み済みのページであればDOMを再利用し、それ以外はSeleniumで読み込み
+            if self._last_loaded_url != url:
+                self.driver.get(url)
+                self._wait_for_action_targets(actions)
+            # 操作によってDOMが変化するため再利用しない
+            self._last_loaded_url = None
             
             for action in actions:
-                print(f"🎯 アクション実行: {action.get('name', '不明')}")
-                print(f"📝 説明: {action.get('description', '')}")
+                self.console.info("🎯 アクション実行: %s", action.get('name', '不明'))
+                self.console.info("📝 説明: %s", action.get('description', ''))
                 
                 action_success = True
                 inputs_processed = 0
                 inputs_successful = 0
+                inputs_skipped = 0
                 
-                # INPUT要素に値を設定
-                inputs = action.get('inputs', [])
-                for input_config in inputs:
-                    xpath = input_config.get('xpath')
-                    description = input_config.get('description', '')
-                    
-                    if not xpath:
-                        continue
-                    
-                    inputs_processed += 1
-                    
-                    # 入力値を取得（固定値、ランダム値、リスト参照をサポート）
-                    value = self._get_input_value(input_config)
-                    
-                    if value is None:
-                        print(f"  ⚠️ 入力値が取得できません: {description}")
-                        continue
-                    
-                    try:
-                        element = WebDriverWait(self.driver, 10).until(
-                            EC.presence_of_element_located((By.XPATH, xpath))
-                        )
-                        element.clear()
-                        element.send_keys(value)
-                        inputs_successful += 1
-                        print(f"  ✅ 入力完了: {description} = {value}")
-                    except TimeoutException:
-                        print(f"  ❌ 要素が見つからない: {xpath} ({description})")
-                        action_success = False
-                    except Exception as e:
-                        print(f"  ❌ 入力エラー: {e}")
-                        action_success = False
-                
-                # 要素をクリック
+                # 高速モードでは入力・クリックを1回のスクリプト実行でまとめて行う（要素が揃っていなければ要素ごとに実行）
                 click_xpath = action.get('click_element')
-                click_successful = False
-                if click_xpath:
-                    try:
-                        element = WebDriverWait(self.driver, 10).until(
-                            EC.element_to_be_clickable((By.XPATH, click_xpath))
-                        )
-                        element.click()
-                        click_successful = True
-                        print(f"  ✅ クリック完了: {click_xpath}")
+                input_values: Dict[int, Optional[str]] = {}
+                batched_inputs = self._perform_action_script(action, input_values) if self.fast_mode else None
+                if batched_inputs is not None:
+                    inputs_processed = inputs_successful = batched_inputs
+                    click_successful = bool(click_xpath)
+                else:
+                    # INPUT要素に値を設定（ページ上の要素をまとめて確認し、見つからない入力欄は短時間だけ待ってからスキップ）
+                    inputs = action.get('inputs', [])
+                    located_elements = self._locate_elements(
+                        [input_config['xpath'] for input_config in inputs if input_config.get('_locator')]
+                    )
+                    late_input_deadline = time.monotonic() + self._LATE_INPUT_WAIT
+                    for index, input_config in enumerate(inputs):
+                        xpath = input_config.get('xpath')
+                        description = input_config.get('description', '')
                         
-                        # クリック後の待機時間
-                        wait_time = action.get('wait_after_click', 3)
-                        time.sleep(wait_time)
+                        if not xpath:
+                            continue
                         
-                    except TimeoutException:
-                        print(f"  ❌ クリック要素が見つからない: {click_xpath}")
-                        action_success = False
-                    except Exception as e:
-                        print(f"  ❌ クリックエラー: {e}")
+                        if (located_elements is not None and input_config.get('_present') is not None
+                                and xpath not in located_elements):
+                            # 遅れて描画される入力欄に備えて待機（待機時間はアクション内で共有）
+                            element = self._wait_for_late_input(input_config, late_input_deadline)
+                            if element is None:
+                                inputs_skipped += 1
+                                self.console.warning("  ⏭️ 要素がページに無いためスキップ: %s (%s)", xpath, description)
+                                continue
+                            located_elements[xpath] = element
+                        
+                        inputs_processed += 1
+                        
+                        if input_config.get('_present') is None:
+                            self.console.warning("  ❌ XPATHの構文エラー: %s (%s)", xpath, description)
+                            action_success = False
+                            continue
+                        
+                        # 入力値を取得（固定値、ランダム値、リスト参照をサポート。一括実行で決定済みならその値を使う）
+                        if index in input_values:
+                            value = input_values[index]
+                        else:
+                            value = self._get_input_value(input_config)
+                        
+                        if value is None:
+                            self.console.warning("  ⚠️ 入力値が取得できません: %s", description)
+                            continue
+                        
+                        try:
+                            element = located_elements.get(xpath) if located_elements is not None else None
+                            if element is None:
+                                element = WebDriverWait(self.driver, 10).until(input_config['_present'])
+                            element.clear()
+                            element.send_keys(value)
+                            inputs_successful += 1
+                            self.console.info("  ✅ 入力完了: %s = %s", description, value)
+                        except TimeoutException:
+                            self.console.warning("  ❌ 要素が見つからない: %s (%s)", xpath, description)
+                            action_success = False
+                        except Exception as e:
+                            self.console.warning("  ❌ 入力エラー: %s", e)
+                            action_success = False
+                    
+                    # 要素をクリック
+                    click_successful = False
+                    if click_xpath and action.get('_clickable') is None:
+                        self.console.warning("  ❌ XPATHの構文エラー: %s", click_xpath)
                         action_success = False
-                
+                    elif click_xpath:
+                        try:
+                            element = WebDriverWait(self.driver, 10).until(action['_clickable'])
+                            previous_url = self.driver.current_url if action.get('wait_for_url_change') else None
+                            element.click()
+                            click_successful = True
+                            self.console.info("  ✅ クリック完了: %s", click_xpath)
+                            
+                            # クリック後の待機
+                            self._wait_after_click(action, previous_url)
+                            
+                        except TimeoutException:
+                            self.console.warning("  ❌ クリック要素が見つからない: %s", click_xpath)
+                            action_success = False
+                        except Exception as e:
+                            self.console.warning("  ❌ クリックエラー: %s", e)
+                            action_success = False
+                    
                 # 最終的な成功判定
-                overall_success = action_success and (inputs_successful == inputs_processed or inputs_processed == 0) and (click_successful or not click_xpath)
+                # ページに無かった入力欄がある場合も失敗として扱う
+                overall_success = (action_success and not inputs_skipped
+                                   and (inputs_successful == inputs_processed or inputs_processed == 0)
+                                   and (click_successful or not click_xpath))
                 
                 # アクション履歴に記録
-                self.action_history.append({
-                    'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                action_entry = {
+                    'timestamp': self._timestamp(),
                     'url': url,
                     'action_name': action.get('name', '不明'),
                     'success': overall_success,
                     'inputs_total': inputs_processed,
                     'inputs_successful': inputs_successful,
+                    'inputs_skipped': inputs_skipped,
                     'click_attempted': bool(click_xpath),
                     'click_successful': click_successful,
                     'description': action.get('description', '')
-                })
+                }
+                self.action_history.append(action_entry)
+                self._record_history('action', action_entry)
                 
                 # 結果表示
+                if inputs_skipped:
+                    self.console.info("      ⏭️ ページに無い入力欄: %d個", inputs_skipped)
                 if overall_success:
-                    print(f"  🎉 アクション '{action.get('name')}' 完了")
-                    print(f"      📊 入力成功: {inputs_successful}/{inputs_processed}, クリック: {'✅' if click_successful or not click_xpath else '❌'}")
+                    self.console.info("  🎉 アクション '%s' 完了", action.get('name'))
                 else:
-                    print(f"  ⚠️ アクション '{action.get('name')}' で一部エラー発生")
-                    print(f"      📊 入力成功: {inputs_successful}/{inputs_processed}, クリック: {'✅' if click_successful or not click_xpath else '❌'}")
+                    self.console.warning("  ⚠️ アクション '%s' で一部エラー発生", action.get('name'))
+                self.console.log(logging.INFO if overall_success else logging.WARNING,
+                                 "      📊 入力成功: %d/%d, クリック: %s", inputs_successful, inputs_processed,
+                                 '✅' if click_successful or not click_xpath else '❌')
             
             return True
             
         except Exception as e:
-            print(f"❌ ページ操作エラー: {e}")
+            self.console.warning("❌ ページ操作エラー: %s", e)
+            return False
+    
+    def _clear_browser_storage(self) -> bool:
+        """現在のオリジンのCookie・ストレージ・キャッシュと閲覧履歴をCDPで削除"""
+        try:
+            parsed = urlparse(self.driver.current_url)
+            if parsed.scheme not in ('http', 'https'):
+                return False
+            origin = f"{parsed.scheme}://{parsed.netloc}"
+            self.driver.execute_cdp_cmd('Storage.clearDataForOrigin', {
+                'origin': origin,
+                'storageTypes': self._RESTART_STORAGE_TYPES
+            })
+            self.driver.execute_cdp_cmd('Page.resetNavigationHistory', {})
+            self.console.info("  🍪 Cookie・ストレージ・キャッシュを削除しました (%s)", origin)
+            return True
+        except Exception as e:
+            self.logger.warning("CDPによるストレージ削除に失敗（JavaScriptで削除）: %s", e)
             return False
     
+    def _clear_browser_storage_js(self):
+        """CookieとWeb Storageを削除（CDPが使えない場合）"""
+        # Cookie削除
+        self.driver.delete_all_cookies()
+        self.console.info("  🍪 Cookieを削除しました")
+        
+        # ローカルストレージ・セッションストレージ削除
+        try:
+            self.driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+            self.console.info("  💾 ローカル・セッションストレージをクリアしました")
+        except Exception as e:
+            self.console.warning("  ⚠️ ストレージクリア警告: %s", e)
+    
     def _perform_browser_restart(self, current_step: int) -> bool:
         """ブラウザリスタートを実行"""
         try:
-            print(f"\n🔄 ブラウザリスタート実行中 (ステップ {current_step})")
+            self.console.info("\n🔄 ブラウザリスタート実行中 (ステップ %d)", current_step)
             
             # リスタート履歴に記録
             restart_entry = {
                 'step': current_step,
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'timestamp': self._timestamp(),
                 'restart_count': self.restart_count + 1,
                 'visited_urls_before': len(self.visited_urls)
             }
             
             if self.driver:
-                # Cookie削除
-                self.driver.delete_all_cookies()
-                print("  🍪 Cookieを削除しました")
-                
-                # ローカルストレージ削除
-                try:
-                    self.driver.execute_script("window.localStorage.clear();")
-                    print("  💾 ローカルストレージをクリアしました")
-                except Exception as e:
-                    print(f"  ⚠️ ローカルストレージクリア警告: {e}")
-                
-                # セッションストレージ削除
-                try:
-                    self.driver.execute_script("window.sessionStorage.clear();")
-                    print("  💾 セッションストレージをクリアしました")
-                except Exception as e:
-                    print(f"  ⚠️ セッションストレージクリア警告: {e}")
-                
-                # キャッシュクリア（可能な範囲で）
-                try:
-                    self.driver.execute_script("window.location.reload(true);")
-                    print("  🔄 ハードリロードを実行しました")
-                except Exception as e:
-                    print(f"  ⚠️ リロード警告: {e}")
+                # ページを再読み込みせずにブラウザのストレージを削除（次のステップでスタートURLへ移動する）
+                if not self._clear_browser_storage():
+                    self._clear_browser_storage_js()
+                self._last_loaded_url = None
             
             # 訪問済みURLリストをクリア
             self.visited_urls.clear()
-            print("  🗂️ 訪問済みURLリストをクリアしました")
+            if self.state_store is not None:
+                self.state_store.clear_visited()
+            if self.content_index is not None:
+                self.content_index.clear()
+            self.console.info("  🗂️ 訪問済みURLリストをクリアしました")
             
             # Requestsセッションも更新
             self.session.cookies.clear()
-            print("  🍪 Requestsセッションのクッキーもクリアしました")
+            if self._http2_client is not None:
+                self._http2_client.cookies.clear()
+            if self._aio_session is not None:
+                self._loop.call_soon_threadsafe(self._aio_session.cookie_jar.clear)
+            self._cancel_prefetches()
+            self.console.info("  🍪 Requestsセッションのクッキーもクリアしました")
             
             # リスタート回数をインクリメント
             self.restart_count += 1
@@ -919,65 +2002,113 @@ class WebCrawler:
             restart_entry['success'] = True
             restart_entry['next_restart_step'] = self.next_restart_step
             self.restart_history.append(restart_entry)
+            self._record_history('restart', restart_entry)
             
-            print(f"  ✅ リスタート完了 (#{self.restart_count})")
+            self.console.info("  ✅ リスタート完了 (#%d)", self.restart_count)
             if self.next_restart_step:
-                print(f"  📅 次回リスタート予定: ステップ {self.next_restart_step}")
+                self.console.info("  📅 次回リスタート予定: ステップ %d", self.next_restart_step)
             else:
-                print(f"  📅 次回リスタート: なし（残りステップ数が少ないため）")
+                self.console.info("  📅 次回リスタート: なし（残りステップ数が少ないため）")
             
             return True
             
         except Exception as e:
-            print(f"  ❌ リスタートエラー: {e}")
+            self.console.warning("  ❌ リスタートエラー: %s", e)
             restart_entry['success'] = False
             restart_entry['error'] = str(e)
             self.restart_history.append(restart_entry)
+            self._record_history('restart', restart_entry)
             return False
     
+    def _timestamp(self) -> str:
+        """履歴用の現在時刻（同じ秒の間は整形済みの文字列を再利用）"""
+        now = int(time.time())
+        if now != self._timestamp_second:
+            self._timestamp_second = now
+            self._timestamp_text = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(now))
+        return self._timestamp_text
+    
+    @staticmethod
+    def _pack_cookies(cookies: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Cookieの一覧を項目ごとの配列にまとめる（Cookieごとのdictを保持しない）"""
+        if not cookies:
+            return {}
+        
+        expiry = array('d')
+        for cookie in cookies:
+            try:
+                expiry.append(float(cookie['expiry']))
+            except (KeyError, TypeError, ValueError):
+                expiry.append(math.nan)  # 有効期限なし（セッションCookie）
+        
+        return {
+            'names': [cookie.get('name', 'N/A') for cookie in cookies],
+            'values': [cookie.get('value', 'N/A') for cookie in cookies],
+            'domains': [cookie.get('domain', 'N/A') for cookie in cookies],
+            'paths': [cookie.get('path', 'N/A') for cookie in cookies],
+            'expiry': expiry,
+            'secure': bytearray(bool(cookie.get('secure', False)) for cookie in cookies),
+            'httpOnly': bytearray(bool(cookie.get('httpOnly', False)) for cookie in cookies),
+        }
+    
     def _add_to_history(self, step: int, url: str, links_found: int, selected_link: str = None, action_performed: bool = False, restart_occurred: bool = False):
         """履歴に追加"""
         # Cookie情報を取得
         cookie_count = 0
-        cookie_details = []
+        cookie_details = {}
         if self.use_selenium and self.driver and self.log_cookies:
             try:
                 cookies = self.driver.get_cookies()
                 cookie_count = len(cookies)
-                cookie_details = cookies  # 詳細情報も保存
+                cookie_details = self._pack_cookies(cookies)  # 詳細情報も保存
             except:
                 pass
         
-        history_entry = {
-            'step': step,
-            'url': url,
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'links_found': links_found,
-            'selected_link': selected_link,
-            'domain': urlparse(url).netloc,
-            'action_performed': action_performed,
-            'restart_occurred': restart_occurred,
-            'cookie_count': cookie_count,
-            'cookie_details': cookie_details
-        }
+        history_entry = HistoryEntry(
+            step=step,
+            url=url,
+            timestamp=self._timestamp(),
+            links_found=links_found,
+            selected_link=selected_link,
+            domain=_netloc(url),
+            action_performed=action_performed,
+            restart_occurred=restart_occurred,
+            cookie_count=cookie_count,
+            cookie_details=cookie_details
+        )
         self.crawl_history.append(history_entry)
+        self._record_history('crawl', history_entry)
+    
+    def _record_history(self, kind: str, entry: Any):
+        """履歴（crawl / action / restart）を1件、SQLite・JSON Linesファイルに保存"""
+        if self.state_store is not None:
+            self.state_store.add_history(kind, entry)
+        if self.history_log is not None:
+            try:
+                record = asdict(entry) if is_dataclass(entry) else entry
+                self.history_log.write(({'kind': kind, **record},))
+            except Exception as e:
+                self.logger.warning("履歴の逐次保存エラー: %s", e)
     
     def _log_cookie_info(self, step: int, url: str):
         """Cookie情報をログに出力"""
-        if not self.use_selenium or not self.driver:
+        if not self.log_cookies or not self.use_selenium or not self.driver:
             return
         
         try:
             cookies = self.driver.get_cookies()
-            if cookies:
-                # 画面には表形式のみ表示
-                print(f"\n🍪 ステップ {step} - Cookie情報 ({len(cookies)}個)")
-                print(f"📍 URL: {url}")
-                
-                # 表形式でヘッダーを表示
-                print("┌" + "─" * 20 + "┬" + "─" * 30 + "┬" + "─" * 20 + "┬" + "─" * 10 + "┐")
-                print("│ {:<18} │ {:<28} │ {:<18} │ {:<8} │".format("Cookie名", "値", "ドメイン", "セキュア"))
-                print("├" + "─" * 20 + "┼" + "─" * 30 + "┼" + "─" * 20 + "┼" + "─" * 10 + "┤")
+            if cookies and not self.console.isEnabledFor(logging.INFO):
+                # 進捗表示を抑制している場合は表を組み立てず、詳細のファイル記録のみ行う
+                self._log_cookie_details_to_file(step, url, cookies)
+            elif cookies:
+                # 画面には表形式のみ表示（表全体を組み立てて1回で出力）
+                lines = [
+                    f"\n🍪 ステップ {step} - Cookie情報 ({len(cookies)}個)",
+                    f"📍 URL: {url}",
+                    self._COOKIE_TABLE_TOP,
+                    self._COOKIE_TABLE_HEADER,
+                    self._COOKIE_TABLE_MIDDLE,
+                ]
                 
                 for cookie in cookies:
                     name = cookie.get('name', 'N/A')
@@ -991,56 +2122,37 @@ class WebCrawler:
                     # セキュアフラグの表示
                     secure_flag = "✓" if secure else "✗"
                     
-                    print("│ {:<18} │ {:<28} │ {:<18} │ {:<8} │".format(
+                    lines.append(self._COOKIE_ROW_FORMAT.format(
                         name[:18], display_value[:28], domain[:18], secure_flag
                     ))
                 
-                print("└" + "─" * 20 + "┴" + "─" * 30 + "┴" + "─" * 20 + "┴" + "─" * 10 + "┘")
+                lines.append(self._COOKIE_TABLE_BOTTOM)
+                self.console.info('\n'.join(lines))
                 
                 # ログファイルに詳細情報を記録（画面には表示しない）
-                self._log_cookie_details_to_file(step, cookies)
+                self._log_cookie_details_to_file(step, url, cookies)
                 
             else:
-                print(f"\n🍪 ステップ {step} - Cookie情報: なし")
-                self.logger.info(f"ステップ {step} - Cookie情報: Cookieなし")
+                self.console.info("\n🍪 ステップ %d - Cookie情報: なし", step)
+                self.logger.info("ステップ %d - Cookie情報: Cookieなし", step)
                 
         except Exception as e:
-            print(f"\n🍪 ステップ {step} - Cookie情報取得エラー: {e}")
-            self.logger.warning(f"Cookie情報取得エラー: {e}")
+            self.console.warning("\n🍪 ステップ %d - Cookie情報取得エラー: %s", step, e)
+            self.logger.warning("Cookie情報取得エラー: %s", e)
     
-    def _log_cookie_details_to_file(self, step: int, cookies: list):
-        """Cookie詳細情報をログファイルに記録（画面には表示しない）"""
+    def _log_cookie_details_to_file(self, step: int, url: str, cookies: list):
+        """Cookie詳細情報をJSON Linesファイルに記録（画面には表示しない）"""
+        self.logger.info("ステップ %d - Cookie情報: %d個のCookieを検出", step, len(cookies))
+        if self.cookie_log is None:
+            return
         try:
-            self.logger.info(f"ステップ {step} - Cookie情報: {len(cookies)}個のCookieを検出")
-            for i, cookie in enumerate(cookies, 1):
-                name = cookie.get('name', 'N/A')
-                value = cookie.get('value', 'N/A')
-                domain = cookie.get('domain', 'N/A')
-                path = cookie.get('path', 'N/A')
-                expiry = cookie.get('expiry', 'N/A')
-                secure = cookie.get('secure', False)
-                http_only = cookie.get('httpOnly', False)
-                
-                # 有効期限の変換
-                expiry_str = 'N/A'
-                if expiry != 'N/A':
-                    try:
-                        expiry_str = datetime.fromtimestamp(expiry).strftime('%Y-%m-%d %H:%M:%S')
-                    except:
-                        expiry_str = str(expiry)
-                
-                self.logger.info(f"  Cookie {i}: {name}")
-                self.logger.info(f"    値: {value}")
-                self.logger.info(f"    ドメイン: {domain}")
-                self.logger.info(f"    パス: {path}")
-                self.logger.info(f"    有効期限: {expiry_str}")
-                self.logger.info(f"    セキュア: {secure}")
-                self.logger.info(f"    HttpOnly: {http_only}")
+            timestamp = self._timestamp()
+            self.cookie_log.write({'step': step, 'url': url, 'timestamp': timestamp, **cookie} for cookie in cookies)
         except Exception as e:
-            self.logger.warning(f"Cookie詳細ログ記録エラー: {e}")
+            self.logger.warning("Cookie詳細ログ記録エラー: %s", e)
     
-    def crawl(self):
-        """クローリング実行"""
+    def crawl(self, resume_from: Optional[str] = None):
+        """クローリング実行（resume_from指定時は逐次保存した履歴の続きから再開）"""
         print("=" * 60)
         print(f"🚀 高機能Webクローリング開始")
         print(f"📍 開始URL: {self.start_url}")
@@ -1050,13 +2162,12 @@ class WebCrawler:
         print(f"🤖 ページ操作: {'有効' if self.use_selenium else '無効'}")
         
         # 除外パターンの表示
-        ignore_patterns = self.config_manager.config.get('ignore_patterns', [])
-        enabled_patterns = [p for p in ignore_patterns if p.get('enabled', True)]
+        enabled_patterns = self.config_manager.enabled_ignore_patterns
         if enabled_patterns:
             print(f"🚫 除外パターン: {len(enabled_patterns)}個有効")
             for pattern in enabled_patterns:
                 pattern_type = pattern.get('type', 'contains')
-                print(f"    • [{pattern_type}] {pattern['pattern']}: {pattern['description']}")
+                print(f"    • [{pattern_type}] {pattern['pattern']}: {pattern.get('description', '')}")
         else:
             print(f"🚫 除外パターン: なし")
         
@@ -1080,356 +2191,768 @@ class WebCrawler:
             print(f"🍪 Cookie情報出力: 有効")
         else:
             print(f"🍪 Cookie情報出力: 無効")
+        
+        if self.parallel_workers > 1:
+            print(f"🧵 並列巡回: {self.parallel_workers}ブラウザ")
             
         print("=" * 60)
         
-        current_url = self.start_url
+        resumed, resume_url = self._resume_from_history(resume_from) if resume_from else (False, None)
+        if self.history_log is not None:
+            # 再開しない場合は前回までの履歴を破棄し、今回の実行の設定を先頭に記録する
+            if not resumed:
+                self.history_log.truncate()
+            self.history_log.write(({'kind': 'run', 'timestamp': self._timestamp(), 'resumed': resumed,
+                                     **self._run_settings()},))
+        
+        if self.parallel_workers > 1 and self.max_steps > 1:
+            self._crawl_parallel(resume_url)
+        else:
+            self._crawl_steps(resume_url)
+        
+        if self.state_store is not None:
+            self.state_store.flush()
+        if self.cookie_log is not None:
+            self.cookie_log.flush()
+        if self.history_log is not None:
+            self.history_log.flush()
+        self._print_summary()
+    
+    def _run_settings(self) -> Dict[str, Any]:
+        """履歴の再開可否の判定に使う設定（実行ごとに履歴の先頭に記録）"""
+        return {'start_url': self.start_url, 'stay_in_domain': self.stay_in_domain}
+    
+    def _resume_from_history(self, path: str) -> Tuple[bool, Optional[str]]:
+        """逐次保存した前回の実行の履歴（JSON Lines）から訪問済みURLを復元し、(再開したか, 再開するURL)を返す
+        
+        設定が今回と異なる場合は再開しない（再開して実行した分は同じ実行の続きとして扱う）
+        """
+        run_settings = None
+        # 前回の実行分の記録（種類, 訪問したURL, 選択したリンク）
+        events: List[Tuple[str, Optional[str], Optional[str]]] = []
+        try:
+            with open(path, 'rb') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # 中断時に書きかけだった行は無視
+                        continue
+                    kind = record.get('kind')
+                    if kind == 'run':
+                        if not record.get('resumed'):
+                            events.clear()
+                        run_settings = {name: record.get(name) for name in self._run_settings()}
+                    elif kind == 'restart' and record.get('success'):
+                        events.append(('restart', None, None))
+                    elif kind == 'crawl' and record.get('url'):
+                        events.append(('crawl', record['url'], record.get('selected_link')))
+        except FileNotFoundError:
+            print(f"⚠️ 再開用の履歴がありません（最初から巡回します）: {path}")
+            return False, None
+        except OSError as e:
+            print(f"⚠️ 再開用の履歴を読み込めません（最初から巡回します）: {e}")
+            return False, None
+        
+        if run_settings != self._run_settings():
+            print(f"⚠️ 前回の履歴は開始URL・ドメイン制限が異なるため再開しません（最初から巡回します）: {path}")
+            return False, None
+        
+        resume_url = None
+        for kind, url, selected_link in events:
+            if kind == 'restart':
+                # リスタート時点で訪問済みURLはクリアされている
+                self.visited_urls.clear()
+            else:
+                url_key, canonical_url = self._url_key(url)
+                self.visited_urls.add(url_key, canonical_url)
+                resume_url = selected_link
+        
+        if resume_url and not self._is_visited(resume_url):
+            print(f"📂 前回の続きから再開します: {resume_url}（訪問済みURL {len(self.visited_urls)}件）")
+            return True, resume_url
+        print(f"📂 前回の訪問済みURLを{len(self.visited_urls)}件読み込みました（開始URLから巡回します）")
+        return True, None
+    
+    def _crawl_steps(self, resume_url: Optional[str] = None):
+        """開始URL（再開時は前回の続きのURL）からmax_steps回のランダム巡回を実行"""
+        current_url = resume_url or self.start_url
+        previous_links: List[str] = []
         
         for step in range(1, self.max_steps + 1):
-            print(f"\n📝 ステップ {step}/{self.max_steps}")
+            if self._stop_event.is_set():
+                self.console.warning("⏹️ 停止指示を受けたため巡回を終了します")
+                break
+            self.console.info("\n📝 ステップ %d/%d", step, self.max_steps)
             
-            # リスタートチェック
-            if (self.restart_enabled and 
-                self.next_restart_step is not None and 
-                step == self.next_restart_step):
+            # リスタートチェック（リスタート後は次回予定が更新されるため、判定はステップ開始時の1回のみ）
+            restart_due = self.restart_enabled and self.next_restart_step == step
+            if restart_due:
                 
                 restart_success = self._perform_browser_restart(step)
                 if restart_success:
                     current_url = self.start_url  # スタートURLに戻る
-                    print(f"🏠 スタートURLに戻ります: {current_url}")
+                    self.console.info("🏠 スタートURLに戻ります: %s", current_url)
                 else:
-                    print("⚠️ リスタートに失敗しましたが、処理を継続します")
+                    self.console.warning("⚠️ リスタートに失敗しましたが、処理を継続します")
             
-            print(f"🔗 現在のURL: {current_url}")
+            self.console.info("🔗 現在のURL: %s", current_url)
             
             # Cookie情報をログに出力
             if self.log_cookies:
                 self._log_cookie_info(step, current_url)
             
-            # ページアクションをチェック・実行
-            action_performed = self._perform_page_actions(current_url)
+            action_performed = False
             
             # 全ページでSelenium使用（マーケティングツール対応）
             if self.use_selenium and self.driver:
                 # Seleniumでページを取得（JavaScript完全実行）
-                if not action_performed:
-                    # アクションが実行されていない場合、新しくページを読み込み
+                if self.content_index is not None:
+                    # 内容の重複判定にはHTMLが必要
                     html_content = self._fetch_page_with_js(current_url)
+                    is_duplicate = self._is_duplicate_content(html_content)
                 else:
-                    # アクションが実行済みの場合、現在のページソースを使用
-                    html_content = self.driver.page_source
+                    # リンクはブラウザから直接取得するため、HTML全体（page_source）は転送しない
+                    html_content = self._load_page_with_js(current_url) or self._fetch_page_fallback(current_url)
+                    is_duplicate = False
+                
+                # ページアクションをチェック・実行（読み込み済みのDOMを再利用）
+                if html_content and not is_duplicate:
+                    action_performed = self._perform_page_actions(current_url)
+                if action_performed:
                     # 現在のURLを更新（リダイレクトされた可能性）
                     current_url = self.driver.current_url
-                    print(f"🔄 現在のURL（操作後）: {current_url}")
+                    self.console.info("🔄 現在のURL（操作後）: %s", current_url)
                 
                 # Seleniumから直接リンクを抽出（JavaScript生成リンクも取得）
-                if html_content:
-                    links = self._extract_links_from_selenium(current_url)
+                if html_content and not is_duplicate:
+                    links_found, links = self._extract_links_from_selenium(current_url)
                 else:
-                    links = []
+                    links_found, links = 0, []
             else:
                 # Seleniumが無効な場合のフォールバック
                 html_content = self._fetch_page_fallback(current_url)
-                if html_content:
-                    links = self._extract_links(html_content, current_url)
+                # 大きなページはワーカーでリンク解析し、その間に内容の重複判定を行う
+                hrefs_future = self._submit_link_parsing(html_content, current_url)
+                is_duplicate = self._is_duplicate_content(html_content)
+                if html_content and not is_duplicate:
+                    links_found, links = self._extract_links(html_content, current_url, hrefs_future)
                 else:
-                    links = []
+                    if hrefs_future is not None:
+                        hrefs_future.cancel()
+                    links_found, links = 0, []
             
             if not html_content:
-                print("❌ ページの取得に失敗しました")
+                self.console.warning("❌ ページの取得に失敗しました")
                 break
             
+            # 既訪問ページとほぼ同じ内容なら、前ページの残りのリンクから選び直す
+            if is_duplicate:
+                self.console.info("♻️ 既訪問ページとほぼ同じ内容のため、リンク抽出を省略します")
+                links = [link for link in previous_links if link != current_url and not self._is_visited(link)]
+                links_found = len(links)
+            
             # 訪問済みに追加
-            self.visited_urls.add(current_url)
+            self._mark_visited(current_url)
             
-            print(f"🔍 {len(links)}個のリンクを発見")
+            self.console.info("🔍 %d個のリンクを発見", links_found)
             
             if not links:
-                print("⚠️ 有効なリンクが見つかりませんでした")
+                self.console.warning("⚠️ 有効なリンクが見つかりませんでした")
                 # リンクが見つからない場合でもリスタートがあれば継続
                 if (self.restart_enabled and 
                     self.next_restart_step is not None and 
                     step < self.next_restart_step and 
                     step < self.max_steps):
-                    print("🔄 リスタート待ちのため処理を継続します")
+                    self.console.info("🔄 リスタート待ちのため処理を継続します")
                     current_url = self.start_url
-                    self._add_to_history(step, current_url, 0, action_performed=action_performed, restart_occurred=(step == self.next_restart_step))
+                    self._add_to_history(step, current_url, 0, action_performed=action_performed, restart_occurred=restart_due)
                     continue
                 else:
-                    self._add_to_history(step, current_url, 0, action_performed=action_performed, restart_occurred=(step == self.next_restart_step))
+                    self._add_to_history(step, current_url, 0, action_performed=action_performed, restart_occurred=restart_due)
                     break
             
             # ランダムにリンクを選択
+            previous_links = links
             selected_link = random.choice(links)
-            print(f"🎯 選択されたリンク: {selected_link}")
+            self.console.info("🎯 選択されたリンク: %s", selected_link)
+            
+            # フォールバック経路では待機中に次ページを先読み
+            if not (self.use_selenium and self.driver):
+                candidates = [selected_link] + [link for link in links if link != selected_link]
+                self._prefetch_links(candidates)
             
             # 履歴に追加
-            restart_occurred = (self.restart_enabled and 
-                              self.next_restart_step is not None and 
-                              step == self.next_restart_step)
-            self._add_to_history(step, current_url, len(links), selected_link, action_performed, restart_occurred)
+            self._add_to_history(step, current_url, links_found, selected_link, action_performed, restart_due)
             
             # 最後のステップでない場合、次のURLに移動
             if step < self.max_steps:
                 current_url = selected_link
-                print(f"⏳ {self.delay}秒待機中...")
-                time.sleep(self.delay)
+                self.console.info("⏳ %s秒待機中...", self.delay)
+                # 停止指示があれば待機を切り上げる
+                self._stop_event.wait(self.delay)
             else:
                 # 最後のステップでは選択したリンクの情報も記録
                 if self.use_selenium and self.driver:
-                    final_html = self._fetch_page_with_js(selected_link)
-                    if final_html:
-                        final_links = self._extract_links_from_selenium(selected_link)
-                        self._add_to_history(step + 1, selected_link, len(final_links))
-                        self.visited_urls.add(selected_link)
+                    if self._load_page_with_js(selected_link):
+                        final_links_found, _ = self._extract_links_from_selenium(selected_link)
+                        self._add_to_history(step + 1, selected_link, final_links_found)
+                        self._mark_visited(selected_link)
                 else:
                     final_html = self._fetch_page_fallback(selected_link)
                     if final_html:
-                        final_links = self._extract_links(final_html, selected_link)
-                        self._add_to_history(step + 1, selected_link, len(final_links))
-                        self.visited_urls.add(selected_link)
+                        final_links_found, _ = self._extract_links(final_html, selected_link)
+                        self._add_to_history(step + 1, selected_link, final_links_found)
+                        self._mark_visited(selected_link)
+    
+    def _crawl_parallel(self, resume_url: Optional[str] = None):
+        """複数のブラウザで独立したランダム巡回を並列実行し、履歴を統合"""
+        worker_count = min(self.parallel_workers, self.max_steps)
+        base_steps, extra_steps = divmod(self.max_steps, worker_count)
+        step_counts = [base_steps + (1 if index < extra_steps else 0) for index in range(worker_count)]
         
-        self._print_summary()
+        # 1台目はこのクローラー自身、2台目以降は別ブラウザのクローラーをスレッドで実行
+        total_steps = self.max_steps
+        self.max_steps = step_counts[0]
+        self._stop_event.clear()
+        # 生成済みのワーカー（中断・エラー時も後始末できるよう、巡回の完了前に登録される）
+        workers: List[WebCrawler] = []
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=worker_count - 1,
+                                                         thread_name_prefix='crawler-worker')
+        try:
+            futures = [
+                executor.submit(self._run_worker, index, max_steps, workers)
+                for index, max_steps in enumerate(step_counts[1:], 1)
+            ]
+            self._crawl_steps(resume_url)
+            
+            for index, future in enumerate(futures, 1):
+                try:
+                    future.result()
+                except Exception as e:
+                    self.logger.error("並列ワーカー%dのエラー: %s", index, e)
+        finally:
+            self.max_steps = total_steps
+            # Ctrl+C・エラー時は実行中のワーカーに停止を指示し、未開始のワーカーは取り消す
+            # （実行中のワーカーは現在のステップを終えた時点で止まる）
+            self._stop_event.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+            
+            for worker in workers:
+                try:
+                    self._merge_worker_history(worker)
+                finally:
+                    worker.close()
+    
+    def _run_worker(self, index: int, max_steps: int, workers: List['WebCrawler']) -> 'WebCrawler':
+        """並列ワーカー用のクローラーを生成してworkersに登録し、巡回（ブラウザのキャッシュ・プロファイルは分ける）"""
+        worker = WebCrawler(
+            start_url=self.start_url, max_steps=max_steps, delay=self.delay,
+            stay_in_domain=self.stay_in_domain, max_links_per_page=self.max_links_per_page,
+            config_file=self.config_file, use_selenium=self.use_selenium,
+            restart_enabled=self.restart_enabled, restart_range=self.restart_range,
+            fast_mode=self.fast_mode, headless=self.headless, log_cookies=self.log_cookies,
+            prefetch_count=self.prefetch_count, fetch_concurrency=self.fetch_concurrency, http2=self.http2,
+            browser_pool_size=self.browser_pool_size,
+            browser_cache_dir=os.path.join(self.browser_cache_dir, f"worker-{index}") if self.browser_cache_dir else None,
+            browser_profile_dir=os.path.join(self.browser_profile_dir, f"worker-{index}") if self.browser_profile_dir else None,
+            content_dedup=self.content_dedup, parser_workers=self.parser_workers, quiet=self.quiet,
+            cookie_log_file=None
+        )
+        # Cookie詳細ログ・履歴の逐次保存は同じファイルに書き込むため共有する
+        worker.cookie_log = self.cookie_log
+        worker.history_log = self.history_log
+        # 停止指示を共有し、後始末は呼び出し元で行う
+        worker._stop_event = self._stop_event
+        workers.append(worker)
+        worker._crawl_steps()
+        return worker
+    
+    def _merge_worker_history(self, worker: 'WebCrawler'):
+        """並列ワーカーの訪問済みURL・履歴をこのクローラーに統合"""
+        self.visited_urls.update(worker.visited_urls.keys())
+        self.crawl_history.extend(worker.crawl_history)
+        self.action_history.extend(worker.action_history)
+        self.restart_history.extend(worker.restart_history)
+        self.restart_count += worker.restart_count
+        
+        if self.state_store is not None:
+            for url_key in worker.visited_urls.keys():
+                self.state_store.add_visited(url_key)
+            for kind, entries in (('crawl', worker.crawl_history), ('action', worker.action_history),
+                                  ('restart', worker.restart_history)):
+                for entry in entries:
+                    self.state_store.add_history(kind, entry)
     
     def _print_summary(self):
-        """結果サマリーを表示"""
-        print("\n" + "=" * 60)
-        print("📊 クローリング結果サマリー")
-        print("=" * 60)
+        """結果サマリーを表示（行を順次生成して書き出し、履歴が長くても一括で文字列を保持しない）"""
+        sys.stdout.writelines(self._summary_lines())
+    
+    def _summary_lines(self) -> Iterator[str]:
+        """結果サマリーの各行（改行付き）を順次生成"""
+        yield "\n" + "=" * 60 + "\n"
+        yield "📊 クローリング結果サマリー\n"
+        yield "=" * 60 + "\n"
         
-        print(f"🔢 総ステップ数: {len(self.crawl_history)}")
-        print(f"🌐 訪問ページ数: {len(self.visited_urls)}")
-        print(f"🤖 実行されたアクション数: {len(self.action_history)}")
+        yield f"🔢 総ステップ数: {len(self.crawl_history)}\n"
+        yield f"🌐 訪問ページ数: {len(self.visited_urls)}\n"
+        yield f"🤖 実行されたアクション数: {len(self.action_history)}\n"
         if self.restart_enabled:
-            print(f"🔄 ブラウザリスタート回数: {self.restart_count}")
+            yield f"🔄 ブラウザリスタート回数: {self.restart_count}\n"
         
         # ドメイン別統計
-        domain_count = {}
-        for entry in self.crawl_history:
-            domain = entry['domain']
-            domain_count[domain] = domain_count.get(domain, 0) + 1
+        domain_count = Counter(entry.domain for entry in self.crawl_history)
         
-        print(f"\n📈 ドメイン別訪問数:")
-        for domain, count in sorted(domain_count.items(), key=lambda x: x[1], reverse=True):
-            print(f"  • {domain}: {count}回")
+        yield "\n📈 ドメイン別訪問数:\n"
+        for domain, count in domain_count.most_common():
+            yield f"  • {domain}: {count}回\n"
         
         # リスタート履歴
         if self.restart_history:
-            print(f"\n🔄 ブラウザリスタート履歴:")
+            yield "\n🔄 ブラウザリスタート履歴:\n"
             for restart in self.restart_history:
                 status = "✅ 成功" if restart['success'] else "❌ 失敗"
-                print(f"  • [{restart['timestamp']}] #{restart['restart_count']}: {status} (ステップ {restart['step']})")
+                yield f"  • [{restart['timestamp']}] #{restart['restart_count']}: {status} (ステップ {restart['step']})\n"
                 if restart.get('next_restart_step'):
-                    print(f"    次回予定: ステップ {restart['next_restart_step']}")
+                    yield f"    次回予定: ステップ {restart['next_restart_step']}\n"
                 if not restart['success'] and restart.get('error'):
-                    print(f"    エラー: {restart['error']}")
+                    yield f"    エラー: {restart['error']}\n"
         
         # アクション実行結果
         if self.action_history:
-            print(f"\n🤖 アクション実行結果:")
+            yield "\n🤖 アクション実行結果:\n"
             successful_actions = sum(1 for action in self.action_history if action['success'])
             total_inputs = sum(action.get('inputs_total', 0) for action in self.action_history)
             successful_inputs = sum(action.get('inputs_successful', 0) for action in self.action_history)
             
-            print(f"  • 成功したアクション: {successful_actions}/{len(self.action_history)}")
-            print(f"  • 入力成功率: {successful_inputs}/{total_inputs} ({(successful_inputs/total_inputs*100):.1f}% )" if total_inputs > 0 else "  • 入力: なし")
+            yield f"  • 成功したアクション: {successful_actions}/{len(self.action_history)}\n"
+            yield f"  • 入力成功率: {successful_inputs}/{total_inputs} ({(successful_inputs/total_inputs*100):.1f}% )\n" if total_inputs > 0 else "  • 入力: なし\n"
             
             for action in self.action_history:
                 status = "✅ 成功" if action['success'] else "❌ 失敗" 
                 inputs_info = f"入力{action.get('inputs_successful', 0)}/{action.get('inputs_total', 0)}"
                 click_info = "クリック✅" if action.get('click_successful') else "クリック❌" if action.get('click_attempted') else "クリックなし"
-                print(f"  • [{action['timestamp']}] {action['action_name']}: {status} ({inputs_info}, {click_info})")
+                yield f"  • [{action['timestamp']}] {action['action_name']}: {status} ({inputs_info}, {click_info})\n"
         
-        print(f"\n📋 詳細履歴:")
+        yield "\n📋 詳細履歴:\n"
         for entry in self.crawl_history:
-            timestamp = entry['timestamp']
-            step = entry['step']
-            url = entry['url']
-            links_found = entry['links_found']
-            selected = entry.get('selected_link', 'なし')
-            action_mark = "🤖" if entry.get('action_performed') else ""
-            restart_mark = "🔄" if entry.get('restart_occurred') else ""
-            
-            print(f"  [{timestamp}] ステップ{step} {action_mark}{restart_mark}: {url}")
-            print(f"    🔗 {links_found}個のリンクを発見")
-            if selected != 'なし':
-                print(f"    ➡️ 次の選択: {selected}")
-            print()
+            action_mark = "🤖" if entry.action_performed else ""
+            restart_mark = "🔄" if entry.restart_occurred else ""
+            
+            yield f"  [{entry.timestamp}] ステップ{entry.step} {action_mark}{restart_mark}: {entry.url}\n"
+            yield f"    🔗 {entry.links_found}個のリンクを発見\n"
+            if entry.selected_link:
+                yield f"    ➡️ 次の選択: {entry.selected_link}\n"
+            yield "\n"
     
     def save_history(self, filename: str = 'crawl_history.txt'):
-        """履歴をファイルに保存"""
+        """履歴をファイルに保存（全体を組み立ててから1回で書き込み）"""
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write("=== 高機能Webクローリング履歴 ===\n\n")
-                f.write(f"開始URL: {self.start_url}\n")
-                f.write(f"最大ステップ数: {self.max_steps}\n")
-                f.write(f"総訪問ページ数: {len(self.visited_urls)}\n")
-                f.write(f"実行されたアクション数: {len(self.action_history)}\n")
-                
-                # 除外パターン情報
-                ignore_patterns = self.config_manager.config.get('ignore_patterns', [])
-                enabled_patterns = [p for p in ignore_patterns if p.get('enabled', True)]
-                if enabled_patterns:
-                    f.write(f"除外パターン数: {len(enabled_patterns)}\n")
-                    for pattern in enabled_patterns:
-                        pattern_type = pattern.get('type', 'contains')
-                        f.write(f"  • [{pattern_type}] {pattern['pattern']}: {pattern['description']}\n")
-                else:
-                    f.write("除外パターン: なし\n")
-                
-                if self.restart_enabled:
-                    f.write(f"ブラウザリスタート回数: {self.restart_count}\n")
-                    f.write(f"リスタート設定: {self.restart_range}\n")
-                f.write("\n")
-                
-                # リスタート履歴
-                if self.restart_history:
-                    f.write("=== ブラウザリスタート履歴 ===\n")
-                    for restart in self.restart_history:
-                        f.write(f"[{restart['timestamp']}] リスタート #{restart['restart_count']}\n")
-                        f.write(f"  ステップ: {restart['step']}\n")
-                        f.write(f"  成功: {restart['success']}\n")
-                        f.write(f"  リスタート前訪問URL数: {restart['visited_urls_before']}\n")
-                        if restart.get('next_restart_step'):
-                            f.write(f"  次回予定ステップ: {restart['next_restart_step']}\n")
-                        if not restart['success'] and restart.get('error'):
-                            f.write(f"  エラー: {restart['error']}\n")
-                        f.write("-" * 30 + "\n")
-                    f.write("\n")
+            parts: List[str] = [
+                "=== 高機能Webクローリング履歴 ===\n\n"
+                f"開始URL: {self.start_url}\n"
+                f"最大ステップ数: {self.max_steps}\n"
+                f"総訪問ページ数: {len(self.visited_urls)}\n"
+                f"実行されたアクション数: {len(self.action_history)}\n"
+            ]
+            
+            # 除外パターン情報
+            enabled_patterns = self.config_manager.enabled_ignore_patterns
+            if enabled_patterns:
+                parts.append(f"除外パターン数: {len(enabled_patterns)}\n")
+                for pattern in enabled_patterns:
+                    pattern_type = pattern.get('type', 'contains')
+                    parts.append(f"  • [{pattern_type}] {pattern['pattern']}: {pattern.get('description', '')}\n")
+            else:
+                parts.append("除外パターン: なし\n")
+            
+            if self.restart_enabled:
+                parts.append(f"ブラウザリスタート回数: {self.restart_count}\n"
+                             f"リスタート設定: {self.restart_range}\n")
+            parts.append("\n")
+            
+            # リスタート履歴
+            if self.restart_history:
+                parts.append("=== ブラウザリスタート履歴 ===\n")
+                for restart in self.restart_history:
+                    parts.append(
+                        f"[{restart['timestamp']}] リスタート #{restart['restart_count']}\n"
+                        f"  ステップ: {restart['step']}\n"
+                        f"  成功: {restart['success']}\n"
+                        f"  リスタート前訪問URL数: {restart['visited_urls_before']}\n"
+                    )
+                    if restart.get('next_restart_step'):
+                        parts.append(f"  次回予定ステップ: {restart['next_restart_step']}\n")
+                    if not restart['success'] and restart.get('error'):
+                        parts.append(f"  エラー: {restart['error']}\n")
+                    parts.append("-" * 30 + "\n")
+                parts.append("\n")
+            
+            parts.append("=== アクション実行履歴 ===\n")
+            for action in self.action_history:
+                parts.append(
+                    f"[{action['timestamp']}] {action['action_name']}\n"
+                    f"  URL: {action['url']}\n"
+                    f"  説明: {action.get('description', 'なし')}\n"
+                    f"  全体成功: {action['success']}\n"
+                    f"  入力総数: {action.get('inputs_total', 0)}\n"
+                    f"  入力成功数: {action.get('inputs_successful', 0)}\n"
+                    f"  クリック試行: {action.get('click_attempted', False)}\n"
+                    f"  クリック成功: {action.get('click_successful', False)}\n"
+                    + "-" * 30 + "\n"
+                )
+            
+            parts.append("\n=== 巡回履歴 ===\n")
+            for entry in self.crawl_history:
+                parts.append(
+                    f"[{entry.timestamp}] ステップ {entry.step}\n"
+                    f"URL: {entry.url}\n"
+                    f"発見リンク数: {entry.links_found}\n"
+                    f"アクション実行: {entry.action_performed}\n"
+                    f"リスタート発生: {entry.restart_occurred}\n"
+                )
                 
-                f.write("=== アクション実行履歴 ===\n")
-                for action in self.action_history:
-                    f.write(f"[{action['timestamp']}] {action['action_name']}\n")
-                    f.write(f"  URL: {action['url']}\n")
-                    f.write(f"  説明: {action.get('description', 'なし')}\n")
-                    f.write(f"  全体成功: {action['success']}\n")
-                    f.write(f"  入力総数: {action.get('inputs_total', 0)}\n")
-                    f.write(f"  入力成功数: {action.get('inputs_successful', 0)}\n")
-                    f.write(f"  クリック試行: {action.get('click_attempted', False)}\n")
-                    f.write(f"  クリック成功: {action.get('click_successful', False)}\n")
-                    f.write("-" * 30 + "\n")
+                # 詳細なCookie情報を出力
+                if self.log_cookies and entry.cookie_details:
+                    parts.append(f"Cookie数: {entry.cookie_count}\nCookie詳細:\n")
+                    columns = entry.cookie_details
+                    for i in range(len(columns['names'])):
+                        expiry = columns['expiry'][i]
+                        
+                        # 有効期限の変換
+                        expiry_str = 'N/A'
+                        if not math.isnan(expiry):
+                            try:
+                                expiry_str = datetime.fromtimestamp(expiry).strftime('%Y-%m-%d %H:%M:%S')
+                            except:
+                                expiry_str = str(expiry)
+                        
+                        parts.append(
+                            f"  {i + 1}. {columns['names'][i]}\n"
+                            f"     値: {columns['values'][i]}\n"
+                            f"     ドメイン: {columns['domains'][i]}\n"
+                            f"     パス: {columns['paths'][i]}\n"
+                            f"     有効期限: {expiry_str}\n"
+                            f"     セキュア: {bool(columns['secure'][i])}\n"
+                            f"     HttpOnly: {bool(columns['httpOnly'][i])}\n"
+                        )
+                elif self.log_cookies:
+                    parts.append(f"Cookie数: {entry.cookie_count}\n")
                 
-                f.write("\n=== 巡回履歴 ===\n")
-                for entry in self.crawl_history:
-                    f.write(f"[{entry['timestamp']}] ステップ {entry['step']}\n")
-                    f.write(f"URL: {entry['url']}\n")
-                    f.write(f"発見リンク数: {entry['links_found']}\n")
-                    f.write(f"アクション実行: {entry.get('action_performed', False)}\n")
-                    f.write(f"リスタート発生: {entry.get('restart_occurred', False)}\n")
-                    
-                    # 詳細なCookie情報を出力
-                    if self.log_cookies and entry.get('cookie_details'):
-                        f.write(f"Cookie数: {entry.get('cookie_count', 0)}\n")
-                        f.write("Cookie詳細:\n")
-                        for i, cookie in enumerate(entry['cookie_details'], 1):
-                            name = cookie.get('name', 'N/A')
-                            value = cookie.get('value', 'N/A')
-                            domain = cookie.get('domain', 'N/A')
-                            path = cookie.get('path', 'N/A')
-                            expiry = cookie.get('expiry', 'N/A')
-                            secure = cookie.get('secure', False)
-                            http_only = cookie.get('httpOnly', False)
-                            
-                            # 有効期限の変換
-                            expiry_str = 'N/A'
-                            if expiry != 'N/A':
-                                try:
-                                    expiry_str = datetime.fromtimestamp(expiry).strftime('%Y-%m-%d %H:%M:%S')
-                                except:
-                                    expiry_str = str(expiry)
-                            
-                            f.write(f"  {i}. {name}\n")
-                            f.write(f"     値: {value}\n")
-                            f.write(f"     ドメイン: {domain}\n")
-                            f.write(f"     パス: {path}\n")
-                            f.write(f"     有効期限: {expiry_str}\n")
-                            f.write(f"     セキュア: {secure}\n")
-                            f.write(f"     HttpOnly: {http_only}\n")
-                    elif self.log_cookies:
-                        f.write(f"Cookie数: {entry.get('cookie_count', 0)}\n")
-                    
-                    if entry.get('selected_link'):
-                        f.write(f"選択リンク: {entry['selected_link']}\n")
-                    f.write("-" * 50 + "\n")
+                if entry.selected_link:
+                    parts.append(f"選択リンク: {entry.selected_link}\n")
+                parts.append("-" * 50 + "\n")
+            
+            with open(filename, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                f.write(''.join(parts))
             
             print(f"📁 履歴を {filename} に保存しました")
         except Exception as e:
             print(f"❌ ファイル保存エラー: {e}")
     
-    def __del__(self):
-        """デストラクタ"""
+    def close(self):
+        """ブラウザ・接続・ワーカープロセスを終了"""
+        if hasattr(self, '_loop'):
+            self._close_async_fetcher()
+        if getattr(self, '_http2_client', None):
+            self._http2_client.close()
+            self._http2_client = None
+        if getattr(self, '_parser_pool', None):
+            self._close_parser_pool()
         if hasattr(self, 'driver') and self.driver:
             try:
                 self.driver.quit()
             except:
                 pass
+            self.driver = None
+        if getattr(self, 'browser_pool', None):
+            self.browser_pool.quit_all()
+        if getattr(self, 'state_store', None):
+            try:
+                self.state_store.close()
+            except Exception:
+                pass
+            self.state_store = None
+        if getattr(self, 'cookie_log', None):
+            try:
+                self.cookie_log.close()
+            except Exception:
+                pass
+            self.cookie_log = None
+        if getattr(self, 'history_log', None):
+            try:
+                self.history_log.close()
+            except Exception:
+                pass
+            self.history_log = None
+    
+    def __del__(self):
+        """デストラクタ"""
+        self.close()
+
+# コマンドラインで指定されなかった設定の既定値（対話入力でEnterのみを押した場合と同じ）
+_CLI_DEFAULTS = {
+    'start_url': "https://example.com",
+    'max_steps': 5,
+    'delay': 3.0,
+    'stay_in_domain': True,
+    'config': "crawler_config.json",
+    'headless': True,
+    'restart': True,
+    'restart_range': "10-20",
+    'fast': True,
+    'log_cookies': True,
+    'save_history': True,
+    'content_dedup': False,
+    'browser_pool_size': 1,
+    'parallel_workers': 1,
+    'quiet': False,
+    'http2': False,
+    'parser_workers': 0,
+}
+
+# 前回の設定の保存先と、表示用の項目名（対話入力を省略して再実行するため）
+CONFIG_CACHE_FILE = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+    'digitalmarketing_crawler', 'last.json'
+)
+_CONFIG_CACHE_LABELS = {
+    'start_url': "開始URL",
+    'max_steps': "最大ステップ数",
+    'delay': "遅延時間(秒)",
+    'stay_in_domain': "同一ドメイン制限",
+    'config': "設定ファイル",
+    'headless': "ヘッドレスモード",
+    'restart': "ブラウザリスタート",
+    'restart_range': "リスタート間隔",
+    'fast': "高速モード",
+    'log_cookies': "Cookie情報出力",
+    'save_history': "履歴の保存",
+    'quiet': "進捗表示の抑制",
+    'content_dedup': "内容重複ページの省略",
+    'state_db': "状態保存DB",
+    'browser_pool_size': "起動済みブラウザ数",
+    'parallel_workers': "並列巡回ブラウザ数",
+    'http2': "HTTP/2での取得",
+    'parser_workers': "HTML解析ワーカー数",
+}
+
+def _load_config_cache() -> Optional[Dict[str, Any]]:
+    """前回の設定を読み込み（無い・壊れている場合はNone）"""
+    try:
+        with open(CONFIG_CACHE_FILE, 'r', encoding='utf-8') as f:
+            settings = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(settings, dict):
+        return None
+    return {name: settings[name] for name in _CONFIG_CACHE_LABELS if name in settings}
+
+def _write_config_cache(settings: Dict[str, Any]):
+    """今回の設定を次回の再利用のために保存"""
+    try:
+        os.makedirs(os.path.dirname(CONFIG_CACHE_FILE), exist_ok=True)
+        with open(CONFIG_CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(settings, f, ensure_ascii=False, indent=2)
+    except OSError as e:
+        print(f"⚠️ 設定の保存に失敗しました: {e}")
+
+def _clear_config_cache():
+    """保存済みの前回の設定を削除"""
+    try:
+        os.remove(CONFIG_CACHE_FILE)
+        print(f"🗑️ 前回の設定を削除しました: {CONFIG_CACHE_FILE}")
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"⚠️ 前回の設定の削除に失敗しました: {e}")
+
+# 巡回中に履歴を逐次保存するファイル（--resumeで続きから巡回する際にも使用）
+HISTORY_JSONL_FILE = "crawl_history.jsonl"
+
+# はい/いいえの入力として受け付ける語（Enterのみは既定値）
+_YES_TOKENS = frozenset({'y', 'yes'})
+_NO_TOKENS = frozenset({'n', 'no'})
+
+def prompt_input(message: str) -> str:
+    """1行入力（標準入力が閉じている・パイプの終端に達した場合は空文字を返し、既定値を使わせる）"""
+    try:
+        return input(message)
+    except EOFError:
+        print()
+        return ""
+
+def prompt_yes_no(message: str, default: bool = True) -> bool:
+    """はい/いいえを有効な入力があるまで尋ねる（Enterのみ・入力終端の場合は既定値）"""
+    suffix = " (Y/n): " if default else " (y/N): "
+    while True:
+        answer = prompt_input(message + suffix).strip().lower()
+        if not answer:
+            return default
+        if answer in _YES_TOKENS:
+            return True
+        if answer in _NO_TOKENS:
+            return False
+        print("⚠️ 無効な入力です。'y'、'n'、またはEnterキーを押してください。")
+
+def build_parser() -> argparse.ArgumentParser:
+    """コマンドライン引数の定義（未指定の項目はNoneのままにし、対話入力か既定値で補う）"""
+    parser = argparse.ArgumentParser(
+        description="高機能自動リンク巡回クローラー（マーケティングツール対応版）",
+        epilog="開始URLを省略して端末から実行した場合、または--interactive指定時は未指定の項目を対話形式で入力します。"
+    )
+    parser.add_argument("start_url", nargs="?", help="開始URL")
+    parser.add_argument("--max-steps", type=int, help="最大ステップ数（既定: 5）")
+    parser.add_argument("--delay", type=float, help="遅延時間・秒（既定: 3.0）")
+    parser.add_argument("--config", help="設定ファイル名（既定: crawler_config.json）")
+    parser.add_argument("--stay-in-domain", action=argparse.BooleanOptionalAction,
+                        help="同一ドメイン内のみ巡回（既定: 有効）")
+    parser.add_argument("--headless", action=argparse.BooleanOptionalAction,
+                        help="ヘッドレスモード（既定: 有効）")
+    parser.add_argument("--restart", action=argparse.BooleanOptionalAction,
+                        help="ブラウザリスタート機能（既定: 有効）")
+    parser.add_argument("--restart-range", help="リスタート間隔（例: 10-20、既定: 10-20）")
+    parser.add_argument("--fast", action=argparse.BooleanOptionalAction,
+                        help="高速モード（既定: 有効）")
+    parser.add_argument("--log-cookies", action=argparse.BooleanOptionalAction,
+                        help="Cookie情報の出力（既定: 有効）")
+    parser.add_argument("--save-history", action=argparse.BooleanOptionalAction,
+                        help="履歴を巡回中にcrawl_history.jsonlへ逐次保存し、終了後にcrawl_history.txtにも保存（既定: 有効）")
+    parser.add_argument("--content-dedup", action=argparse.BooleanOptionalAction,
+                        help="内容がほぼ同じページのリンク抽出・操作を省略（既定: 無効）")
+    parser.add_argument("--state-db", metavar="PATH",
+                        help="訪問済みURL・履歴を保存するSQLiteファイル（指定時は前回の訪問済みURLを引き継ぐ）")
+    parser.add_argument("--browser-pool-size", type=int,
+                        help="起動済みで保持するChromeの台数（既定: 1）")
+    parser.add_argument("--parallel-workers", type=int,
+                        help="並列に巡回するブラウザ数（最大ステップ数を分担、既定: 1）")
+    parser.add_argument("--http2", action=argparse.BooleanOptionalAction,
+                        help="フォールバック取得にhttpx（HTTP/2）を使用（既定: 無効、httpx[http2]が必要）")
+    parser.add_argument("--parser-workers", type=int,
+                        help="大きなHTMLのリンク解析に使うワーカープロセス数（--content-dedupと併用時のみ有効、既定: 0）")
+    parser.add_argument("--quiet", action=argparse.BooleanOptionalAction,
+                        help="ステップごとの進捗表示を抑制（既定: 無効）")
+    parser.add_argument("--interactive", action="store_true",
+                        help="未指定の項目を対話形式で入力")
+    parser.add_argument("--resume", action="store_true",
+                        help="前回の設定を確認なしで再利用し、crawl_history.jsonlの続きから巡回")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="前回の設定を再利用せず、今回の設定も保存しない")
+    parser.add_argument("--reset-config", action="store_true",
+                        help="保存済みの前回の設定を削除してから開始")
+    return parser
+
+def _print_selenium_required():
+    """Seleniumが無い場合の案内を表示"""
+    print("❌ seleniumが必須です。以下のコマンドでインストールしてください:")
+    print("pip install selenium")
+    print("また、ChromeDriverも必要です。")
+    print("マーケティングツール動作確認のため、Selenium必須です。")
 
-def main():
+def main(argv: Optional[List[str]] = None):
     """メイン関数"""
-    print("🕷️ 高機能自動リンク巡回クローラー（マーケティングツール対応版）")
-    print("=" * 60)
-    
-    # 依存関係チェック
-    if not SELENIUM_AVAILABLE:
-        print("❌ seleniumが必須です。以下のコマンドでインストールしてください:")
-        print("pip install selenium")
-        print("また、ChromeDriverも必要です。")
-        print("マーケティングツール動作確認のため、Selenium必須です。")
+    args = build_parser().parse_args(argv)
+    # リスタート間隔の指定はリスタート機能の有効化を兼ねる
+    if args.restart is None and args.restart_range is not None:
+        args.restart = True
+    
+    # 再開時は前回の設定を確認なしで引き継ぐ（コマンドラインの指定が優先）
+    if args.resume and not args.no_cache:
+        for name, value in (_load_config_cache() or {}).items():
+            if getattr(args, name) is None:
+                setattr(args, name, value)
+    
+    # 開始URLを省略して端末から実行した場合は従来どおり対話形式で入力（再開時は尋ねない）
+    interactive = not args.resume and (args.interactive or (args.start_url is None and sys.stdin.isatty()))
+    if not interactive:
+        for name, value in _CLI_DEFAULTS.items():
+            if getattr(args, name) is None:
+                setattr(args, name, value)
+    
+    sys.stdout.write("🕷️ 高機能自動リンク巡回クローラー（マーケティングツール対応版）\n" + "=" * 60 + "\n")
+    sys.stdout.flush()
+    
+    # 依存関係チェック（有無だけを先に確認し、読み込みは設定入力と並行してバックグラウンドで行う）
+    if importlib.util.find_spec('selenium') is None:
+        _print_selenium_required()
         return
+    import_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='selenium-import')
+    selenium_future = import_executor.submit(_ensure_selenium)
+    import_executor.shutdown(wait=False)
     
-    print("🎯 マーケティングツール動作確認対応:")
-    print("  • Google Tag Manager")
-    print("  • Google Analytics") 
-    print("  • Facebook Pixel")
-    print("  • Adobe Analytics")
-    print("  • その他JavaScriptタグ")
-    print()
+    sys.stdout.write(
+        "🎯 マーケティングツール動作確認対応:\n"
+        "  • Google Tag Manager\n"
+        "  • Google Analytics\n"
+        "  • Facebook Pixel\n"
+        "  • Adobe Analytics\n"
+        "  • その他JavaScriptタグ\n\n"
+    )
+    sys.stdout.flush()
+    
+    # 前回の設定があれば、再利用するかだけを尋ねる（コマンドラインの指定が優先）
+    if args.reset_config:
+        _clear_config_cache()
+    cached_settings = _load_config_cache() if interactive and not args.no_cache else None
+    if cached_settings:
+        lines = ["📂 前回の設定:"]
+        for name, value in cached_settings.items():
+            if isinstance(value, bool):
+                value = '有効' if value else '無効'
+            elif value is None:
+                value = 'なし'
+            lines.append(f"  • {_CONFIG_CACHE_LABELS[name]}: {value}")
+        sys.stdout.write("\n".join(lines) + "\n")
+        if prompt_yes_no("以前の設定を再利用しますか?"):
+            for name, value in cached_settings.items():
+                if getattr(args, name) is None:
+                    setattr(args, name, value)
+            for name, value in _CLI_DEFAULTS.items():
+                if getattr(args, name) is None:
+                    setattr(args, name, value)
+        print()
     
-    # ユーザー入力
-    start_url = input("開始URL: ").strip()
-    if not start_url:
-        start_url = "https://example.com"
-        print(f"デフォルトURL使用: {start_url}")
+    # ユーザー入力（コマンドラインで指定済みの項目は尋ねない）
+    start_url = args.start_url
+    if start_url is None:
+        start_url = prompt_input("開始URL: ").strip()
+        if not start_url:
+            start_url = _CLI_DEFAULTS['start_url']
+            print(f"デフォルトURL使用: {start_url}")
     
+    max_steps = args.max_steps
+    delay = args.delay
     try:
-        max_steps = int(input("最大ステップ数 (デフォルト: 5): ") or 5)
-        delay = float(input("遅延時間(秒) (デフォルト: 3.0): ") or 3.0)
+        if max_steps is None:
+            max_steps = int(prompt_input("最大ステップ数 (デフォルト: 5): ") or 5)
+        if delay is None:
+            delay = float(prompt_input("遅延時間(秒) (デフォルト: 3.0): ") or 3.0)
     except ValueError:
-        max_steps = 5
-        delay = 3.0
+        if max_steps is None:
+            max_steps = _CLI_DEFAULTS['max_steps']
+        if delay is None:
+            delay = _CLI_DEFAULTS['delay']
         print("デフォルト値を使用します")
     
     # 同一ドメイン制限の設定
-    while True:
-        stay_in_domain_input = input("同一ドメイン内のみ巡回? (Y/n): ").strip().lower()
-        if stay_in_domain_input in ['y', 'yes', '']:
-            stay_in_domain = True
-            break
-        elif stay_in_domain_input in ['n', 'no']:
-            stay_in_domain = False
-            break
-        else:
-            print("⚠️ 無効な入力です。'y'、'n'、またはEnterキーを押してください。")
+    stay_in_domain = args.stay_in_domain
+    if stay_in_domain is None:
+        stay_in_domain = prompt_yes_no("同一ドメイン内のみ巡回?")
     
-    config_file = input("設定ファイル名 (デフォルト: crawler_config.json): ").strip()
-    if not config_file:
-        config_file = "crawler_config.json"
+    config_file = args.config
+    if config_file is None:
+        config_file = prompt_input("設定ファイル名 (デフォルト: crawler_config.json): ").strip()
+        if not config_file:
+            config_file = _CLI_DEFAULTS['config']
     
     # Seleniumは必須なので、設定のみ確認
     print("\n--- ブラウザ設定 ---")
     print("💡 マーケティングツール動作確認のため、Seleniumは常に有効です")
     
     # ヘッドレスモード設定
-    while True:
-        headless_input = input("ヘッドレスモード（ブラウザ非表示）を使用? (Y/n): ").strip().lower()
-        if headless_input in ['y', 'yes', '']:
-            headless = True
-            break
-        elif headless_input in ['n', 'no']:
-            headless = False
-            break
-        else:
-            print("⚠️ 無効な入力です。'y'、'n'、またはEnterキーを押してください。")
+    headless = args.headless
+    if headless is None:
+        headless = prompt_yes_no("ヘッドレスモード（ブラウザ非表示）を使用?")
     
     if headless:
         print("✅ ヘッドレスモード: 有効（高速・省リソース）")
@@ -1440,26 +2963,21 @@ def main():
     
     # ブラウザリスタート設定
     print("\n--- ブラウザリスタート設定 ---")
-    while True:
-        restart_input = input("ブラウザリスタート機能を使用? (Y/n): ").strip().lower()
-        if restart_input in ['y', 'yes', '']:
-            restart_enabled = True
-            break
-        elif restart_input in ['n', 'no']:
-            restart_enabled = False
-            break
-        else:
-            print("⚠️ 無効な入力です。'y'、'n'、またはEnterキーを押してください。")
+    restart_enabled = args.restart
+    if restart_enabled is None:
+        restart_enabled = prompt_yes_no("ブラウザリスタート機能を使用?")
     
-    restart_range = "10-20"  # デフォルト値
+    restart_range = args.restart_range or _CLI_DEFAULTS['restart_range']
     if restart_enabled:
-        print("リスタート間隔を設定してください:")
-        print("例: 10-20 (10〜20ステップ間でランダム)")
-        print("例: 15 (15ステップ毎に必ず実行)")
-        range_input = input("リスタート間隔 (デフォルト: 10-20): ").strip()
-        if range_input:
-            # 全角ハイフンを半角ハイフンに変換
-            restart_range = range_input.replace('−', '-').replace('—', '-').replace('–', '-')
+        if args.restart_range is None:
+            print("リスタート間隔を設定してください:")
+            print("例: 10-20 (10〜20ステップ間でランダム)")
+            print("例: 15 (15ステップ毎に必ず実行)")
+            range_input = prompt_input("リスタート間隔 (デフォルト: 10-20): ").strip()
+            if range_input:
+                restart_range = range_input
+        # 全角ハイフンを半角ハイフンに変換
+        restart_range = restart_range.replace('−', '-').replace('—', '-').replace('–', '-')
         print(f"✅ リスタート設定: {restart_range}ステップ間隔")
     else:
         print("❌ リスタート機能: 無効")
@@ -1468,16 +2986,9 @@ def main():
     print("\n--- 処理速度設定 ---")
     print("⚡ 高速モード: タグ検出時間を最小化（推奨）")
     print("🐌 安全モード: 確実にタグ検出（遅い）")
-    while True:
-        fast_mode_input = input("高速モードを使用? (Y/n): ").strip().lower()
-        if fast_mode_input in ['y', 'yes', '']:
-            fast_mode = True
-            break
-        elif fast_mode_input in ['n', 'no']:
-            fast_mode = False
-            break
-        else:
-            print("⚠️ 無効な入力です。'y'、'n'、またはEnterキーを押してください。")
+    fast_mode = args.fast
+    if fast_mode is None:
+        fast_mode = prompt_yes_no("高速モードを使用?")
     
     if fast_mode:
         print("✅ 高速モード: 有効（約3-5秒/ページ）")
@@ -1486,32 +2997,48 @@ def main():
     
     # Cookie情報出力設定
     print("\n--- Cookie情報出力設定 ---")
-    while True:
-        cookie_log_input = input("Cookie情報をログに出力しますか? (Y/n): ").strip().lower()
-        if cookie_log_input in ['y', 'yes', '']:
-            log_cookies = True
-            break
-        elif cookie_log_input in ['n', 'no']:
-            log_cookies = False
-            break
-        else:
-            print("⚠️ 無効な入力です。'y'、'n'、またはEnterキーを押してください。")
+    log_cookies = args.log_cookies
+    if log_cookies is None:
+        log_cookies = prompt_yes_no("Cookie情報をログに出力しますか?")
     
     if log_cookies:
         print("✅ Cookie情報出力: 有効")
     else:
         print("❌ Cookie情報出力: 無効")
     
-    print("\n" + "=" * 60)
-    print("🚀 設定完了！マーケティングツール対応クローリングを開始します...")
-    print("📊 JavaScript・タグマネージャー完全実行モード")
+    # 設定内容はまとめて1回で出力
+    banner = [
+        "\n" + "=" * 60,
+        "🚀 設定完了！マーケティングツール対応クローリングを開始します...",
+        "📊 JavaScript・タグマネージャー完全実行モード",
+    ]
     if fast_mode:
-        print("⚡ 高速モード有効")
+        banner.append("⚡ 高速モード有効")
     if headless:
-        print("👻 ヘッドレスモード有効")
+        banner.append("👻 ヘッドレスモード有効")
     else:
-        print("🖥️ ブラウザ表示モード有効")
-    print("=" * 60)
+        banner.append("🖥️ ブラウザ表示モード有効")
+    banner.append("=" * 60)
+    sys.stdout.write("\n".join(banner) + "\n")
+    sys.stdout.flush()
+    
+    # 対話入力で尋ねない項目（コマンドラインのみで指定）は既定値で補う
+    for name, value in _CLI_DEFAULTS.items():
+        if getattr(args, name) is None:
+            setattr(args, name, value)
+    
+    # 履歴は巡回中に逐次保存し、終了後にテキスト形式でも保存（確認は行わない）
+    save_history = args.save_history
+    
+    if args.http2 and not (HTTPX_AVAILABLE and importlib.util.find_spec('h2') is not None):
+        print("❌ --http2 には httpx[http2] が必要です")
+        print('💡 インストール: pip install "httpx[http2]"')
+        return
+    
+    # Seleniumの読み込み完了を待ってからクローラーを生成
+    if not selenium_future.result():
+        _print_selenium_required()
+        return
     
     # クローラー実行
     crawler = WebCrawler(
@@ -1525,28 +3052,44 @@ def main():
         restart_range=restart_range,
         fast_mode=fast_mode,
         headless=headless,
-        log_cookies=log_cookies
+        log_cookies=log_cookies,
+        quiet=args.quiet,
+        history_file=HISTORY_JSONL_FILE if save_history else None,
+        content_dedup=args.content_dedup,
+        state_db=args.state_db,
+        browser_pool_size=args.browser_pool_size,
+        parallel_workers=args.parallel_workers,
+        http2=args.http2,
+        parser_workers=args.parser_workers
     )
+    if not args.no_cache:
+        _write_config_cache({
+            'start_url': start_url, 'max_steps': max_steps, 'delay': delay,
+            'stay_in_domain': stay_in_domain, 'config': config_file, 'headless': headless,
+            'restart': restart_enabled, 'restart_range': restart_range,
+            'fast': fast_mode, 'log_cookies': log_cookies, 'save_history': save_history, 'quiet': args.quiet,
+            'content_dedup': args.content_dedup, 'state_db': args.state_db,
+            'browser_pool_size': args.browser_pool_size, 'parallel_workers': args.parallel_workers,
+            'http2': args.http2, 'parser_workers': args.parser_workers,
+        })
     
     try:
-        crawler.crawl()
-        
-        # 履歴保存の確認
-        while True:
-            save_input = input("\n履歴をファイルに保存しますか? (Y/n): ").strip().lower()
-            if save_input in ['y', 'yes', '']:
-                crawler.save_history()
-                break
-            elif save_input in ['n', 'no']:
-                break
-            else:
-                print("⚠️ 無効な入力です。'y'、'n'、またはEnterキーを押してください。")
+        crawler.crawl(resume_from=HISTORY_JSONL_FILE if args.resume else None)
     
     except KeyboardInterrupt:
         print("\n\n⚠️ ユーザーによって中断されました")
+        if save_history:
+            print("💡 --resume を指定して実行すると続きから巡回できます")
     except Exception as e:
         print(f"\n❌ エラーが発生しました: {e}")
+    finally:
+        # 中断・エラー時もそれまでの履歴を保存し、逐次保存中の履歴をディスクに書き出す
+        try:
+            if save_history and crawler.crawl_history:
+                crawler.save_history()
+        finally:
+            crawler.close()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()